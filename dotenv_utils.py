@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.env 파일 파서 - 실행/테스트/검증 스크립트 공용
+"""
+import re
+from pathlib import Path
+
+# .env 한 줄: KEY=VALUE (주석/빈 줄 제외, 값 앞뒤 공백 제거)
+_ENV_RE = re.compile(r'^[ \t]*([^#=\s]+)[ \t]*=[ \t]*(.*?)\s*$', re.MULTILINE)
+
+
+def parse_dotenv(path):
+    """.env 파일을 KEY → VALUE 딕셔너리로 파싱"""
+    return dict(_ENV_RE.findall(Path(path).read_text(encoding='utf-8')))
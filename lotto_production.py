@@ -15,7 +15,7 @@ import argparse
 import signal
 import asyncio
 import atexit
-from datetime import datetime
+from datetime import datetime, timedelta
 from collections import Counter
 from pathlib import Path
 
@@ -26,7 +26,7 @@ from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 
 # 현재 디렉토리를 Python path에 추가
 current_dir = Path(__file__).parent
@@ -60,6 +60,9 @@ if notification_result:
 else:
     NotificationManager, run_notification = None, None
 
+# 구매 요일 (월, 목)
+PURCHASE_WEEKDAYS = (0, 3)
+
 class LottoStatistics:
     """로또 통계 분석 클래스"""
     
@@ -223,13 +226,20 @@ class ProductionLottoBuyer:
         # 외부 모듈 초기화
         self._init_external_modules()
     
+    def _quit_driver(self):
+        """브라우저 드라이버만 종료 (알림 매니저는 유지)"""
+        if self.driver:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+    
     def cleanup(self):
         """정리 함수 - 리소스 해제"""
         try:
             # 브라우저 드라이버 정리
-            if self.driver:
-                self.driver.quit()
-                self.driver = None
+            self._quit_driver()
             
             # 알림 매니저 정리 (HTTP 세션 닫기)
             if self.notification_manager:
@@ -310,6 +320,9 @@ class ProductionLottoBuyer:
                 "min_balance": 5000,
                 "recharge_method": "account_transfer"
             },
+            "schedule": {
+                "time": "14:00"  # 데몬 모드 구매 시각 (월/목)
+            },
             "options": {
                 "save_screenshot": True,
                 "headless": True,
@@ -469,15 +482,22 @@ class ProductionLottoBuyer:
             options.add_experimental_option("excludeSwitches", ["enable-automation"])
             options.add_experimental_option('useAutomationExtension', False)
             
+            # 리소스 로딩 최소화 (이미지/GPU/확장 비활성화)
+            options.add_argument('--disable-gpu')
+            options.add_argument('--disable-dev-shm-usage')
+            options.add_argument('--disable-extensions')
+            options.add_argument('--blink-settings=imagesEnabled=false')
+            options.add_argument('--disable-features=TranslateUI')
+            options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+            
+            # DOMContentLoaded 시점에 driver.get 반환 (이후 WebDriverWait로 요소 대기)
+            options.page_load_strategy = 'eager'
+            
             # 도커/헤드리스 환경 옵션
             if self.config['options']['headless']:
                 options.add_argument('--headless=new')
-                options.add_argument('--disable-gpu')
                 options.add_argument('--no-sandbox')
-                options.add_argument('--disable-dev-shm-usage')
-                options.add_argument('--disable-extensions')
                 options.add_argument('--disable-plugins')
-                options.add_argument('--disable-images')
                 options.add_argument('--window-size=1920,1080')
                 options.add_argument('--memory-pressure-off')
                 options.add_argument('--max_old_space_size=4096')
@@ -527,8 +547,7 @@ class ProductionLottoBuyer:
             user_id = self.config['login']['user_id']
             password = self.config['login']['password']
             
-            if self.notification_manager:
-                run_notification(self.notification_manager.notify_login_start(user_id))
+            self._notify('notify_login_start', user_id)
             
             self.logger.info("🔐 TAB + ENTER 로그인 시작")
             self.driver.get("https://www.dhlottery.co.kr/user.do?method=login")
@@ -591,15 +610,13 @@ class ProductionLottoBuyer:
             if login_success:
                 self.logger.info("🎉 TAB + ENTER 로그인 성공!")
                 
-                if self.notification_manager:
-                    run_notification(self.notification_manager.notify_login_success(user_id))
+                self._notify('notify_login_success', user_id)
                 
                 return True
             else:
                 self.logger.error("❌ 로그인 실패")
                 
-                if self.notification_manager:
-                    run_notification(self.notification_manager.notify_login_failure(user_id, "TAB + ENTER 로그인 실패"))
+                self._notify('notify_login_failure', user_id, "TAB + ENTER 로그인 실패")
                 
                 return False
                 
@@ -639,8 +656,7 @@ class ProductionLottoBuyer:
                                 if 0 <= balance <= 50000000:
                                     self.logger.info(f"✅ 예치금 발견: {balance:,}원")
                                     
-                                    if self.notification_manager:
-                                        run_notification(self.notification_manager.notify_balance_check(balance))
+                                    self._notify('notify_balance_check', balance)
                                     
                                     return balance
                 except Exception:
@@ -919,15 +935,39 @@ class ProductionLottoBuyer:
             self.logger.error(f"구매 실패: {e}")
             return 0
 
-    def run(self, immediate=False):
-        """메인 실행"""
+    def _notify(self, event, *args):
+        """알림 전송 - 알림 실패가 구매 흐름을 중단시키지 않도록 격리"""
+        if not self.notification_manager:
+            return
+        try:
+            run_notification(getattr(self.notification_manager, event)(*args))
+        except Exception as e:
+            self.logger.warning(f"⚠️ 알림 전송 실패 ({event}): {e}")
+    
+    def _is_driver_alive(self):
+        """재사용할 드라이버 세션이 살아있는지 확인"""
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
+    
+    def run(self, immediate=False, keep_driver=False):
+        """메인 실행 (keep_driver=True면 실행 후 드라이버를 유지)"""
+        # 구매 여부는 실행 시작 시 한 번만 판단
+        today_wd = datetime.now().weekday()
+        is_purchase_day = immediate or today_wd in PURCHASE_WEEKDAYS
+        
         try:
             self.logger.info("🚀 TAB + ENTER 방식 자동화 로또 구매 시작")
             
-            if self.notification_manager:
-                run_notification(self.notification_manager.notify_program_start())
+            self._notify('notify_program_start')
             
-            if not self.setup_driver():
+            if self.driver and not self._is_driver_alive():
+                self.logger.warning("⚠️ 기존 드라이버 세션 만료 - 재시작합니다")
+                self._quit_driver()
+            
+            if not self.driver and not self.setup_driver():
                 raise Exception("드라이버 초기화 실패")
             
             if not self.login():
@@ -942,34 +982,30 @@ class ProductionLottoBuyer:
                 if self.config['payment'].get('auto_recharge', False):
                     recharge_amount = self.config['payment'].get('recharge_amount', 10000)
                     
-                    if self.notification_manager:
-                        run_notification(self.notification_manager.notify_recharge_start(recharge_amount))
+                    self._notify('notify_recharge_start', recharge_amount)
                     
                     if self.auto_recharger.auto_recharge(self.driver, balance):
                         self.logger.info("💳 충전 완료!")
                         balance = self.check_balance()
                         
-                        if self.notification_manager:
-                            run_notification(self.notification_manager.notify_recharge_success(recharge_amount, balance))
+                        self._notify('notify_recharge_success', recharge_amount, balance)
                     else:
                         raise Exception("자동충전 실패")
                 else:
                     if balance < 1000:
                         raise Exception("잔액 부족")
             
-            if immediate or datetime.now().weekday() in [0, 3]:
+            if is_purchase_day:
                 purchase_count = self.config['purchase']['count']
                 
-                if self.notification_manager:
-                    run_notification(self.notification_manager.notify_purchase_start(purchase_count))
+                self._notify('notify_purchase_start', purchase_count)
                 
                 success_count = self.buy_lotto_games(purchase_count)
                 
                 if success_count > 0:
                     self.logger.info(f"🎉 구매 완료: {success_count}/{purchase_count}")
                     
-                    if self.notification_manager:
-                        run_notification(self.notification_manager.notify_purchase_success(success_count, success_count * 1000))
+                    self._notify('notify_purchase_success', success_count, success_count * 1000)
                     
                     return True
                 else:
@@ -978,15 +1014,50 @@ class ProductionLottoBuyer:
                 self.logger.info("📅 구매 스케줄이 아님 (월/목 또는 --now)")
                 return True
             
+        except (TimeoutException, WebDriverException) as e:
+            self.logger.error(f"❌ 브라우저 오류: {e}")
+            
+            self._notify('notify_critical', "브라우저 오류", str(e))
+            
+            # 깨진 세션은 다음 실행(데몬 재시도)에서 새로 띄우도록 폐기
+            self._quit_driver()
+            
+            return False
         except Exception as e:
             self.logger.error(f"❌ 실행 실패: {e}")
             
-            if self.notification_manager:
-                run_notification(self.notification_manager.notify_critical("시스템 실패", str(e)))
+            self._notify('notify_critical', "시스템 실패", str(e))
+            
+            # 실패한 세션은 다음 실행에서 새로 띄우도록 폐기
+            if keep_driver:
+                self._quit_driver()
             
             return False
         finally:
-            self.cleanup()
+            if not keep_driver:
+                self.cleanup()
+    
+    def _next_purchase_slot(self, now=None):
+        """다음 구매 시각 계산 (월/목 + schedule.time)"""
+        now = now or datetime.now()
+        purchase_time = self.config.get('schedule', {}).get('time', '14:00')
+        hour, minute = (int(part) for part in purchase_time.split(':'))
+        
+        for days_ahead in range(8):
+            slot = (now + timedelta(days=days_ahead)).replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if slot.weekday() in PURCHASE_WEEKDAYS and slot > now:
+                return slot
+    
+    def run_daemon(self):
+        """데몬 모드 - 프로세스와 드라이버를 유지한 채 월/목 구매 시각마다 실행 (cron 대체)"""
+        self.logger.info("🕒 데몬 모드 시작")
+        
+        while True:
+            next_slot = self._next_purchase_slot()
+            self.logger.info(f"⏳ 다음 구매 예정: {next_slot.strftime('%Y-%m-%d %H:%M')}")
+            time.sleep(max(0, (next_slot - datetime.now()).total_seconds()))
+            
+            self.run(immediate=True, keep_driver=True)
 
 def main():
     """메인 함수"""
@@ -994,6 +1065,7 @@ def main():
     parser.add_argument('--now', action='store_true', help='즉시 구매')
     parser.add_argument('--test', action='store_true', help='테스트 모드')
     parser.add_argument('--config', action='store_true', help='설정 확인')
+    parser.add_argument('--daemon', action='store_true', help='데몬 모드 (월/목 구매 시각마다 실행)')
     
     args = parser.parse_args()
     
@@ -1012,6 +1084,11 @@ def main():
             return
         
         buyer = ProductionLottoBuyer()
+        
+        if args.daemon:
+            buyer.run_daemon()
+            return
+        
         success = buyer.run(immediate=args.now)
         
         if success:
@@ -8,82 +8,242 @@ TAB + ENTER 방식 적용 완전 자동화 로또 구매 시스템
 import sys
 import os
 import json
+import re
 import time
 import logging
 import random
 import argparse
 import signal
-from datetime import datetime
-from collections import Counter
-from pathlib import Path
-import numpy as np
-
-# Selenium imports
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait, Select
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-
-# 현재 디렉토리를 Python path에 추가
-current_dir = Path(__file__).parent
-sys.path.insert(0, str(current_dir))
+import atexit
+import functools
+import copy
+from datetime import datetime, timedelta
 
-# 모듈 import (fallback 포함)
-def safe_import(module_name, fallback_message):
-    """안전한 모듈 import"""
+from dotenv_utils import parse_dotenv
+
+# numpy / Selenium / requests는 무거우므로 실제로 필요할 때 로드 (--help, --config 등은 import 비용 없음)
+np = None
+webdriver = By = WebDriverWait = Select = EC = Options = Keys = None
+TimeoutException = NoSuchElementException = None
+
+def _load_numpy():
+    """numpy 지연 로드"""
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+
+def _load_selenium():
+    """Selenium 지연 로드 - 드라이버 생성 전에 호출"""
+    global webdriver, By, WebDriverWait, Select, EC, Options, Keys
+    global TimeoutException, NoSuchElementException
+    if webdriver is not None:
+        return
+    from selenium import webdriver as _webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait, Select
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.common.keys import Keys
+    from selenium.common.exceptions import TimeoutException, NoSuchElementException
+    webdriver = _webdriver
+
+def _load_auto_recharger():
+    """auto_recharge 지연 로드 (Selenium/OCR 라이브러리를 import하므로 자동충전 사용 시에만)"""
     try:
-        if module_name == 'auto_recharge':
-            from auto_recharge import AutoRecharger
-            return AutoRecharger
-        elif module_name == 'credential_manager':
-            from credential_manager import CredentialManager
-            return CredentialManager
-        elif module_name == 'discord_notifier':
-            from discord_notifier import NotificationManager, run_notification
-            return (NotificationManager, run_notification)
+        from auto_recharge import AutoRecharger
+        return AutoRecharger
     except ImportError as e:
-        print(f"⚠️ {module_name} 로드 실패: {e}")
-        print(f"📝 {fallback_message}")
+        print(f"⚠️ auto_recharge 로드 실패: {e}", file=sys.stderr)
+        print("📝 자동충전 기능이 비활성화됩니다.", file=sys.stderr)
         return None
 
-# 모듈 로드
-AutoRecharger = safe_import('auto_recharge', "자동충전 기능이 비활성화됩니다.")
-CredentialManager = safe_import('credential_manager', "인증정보 암호화 기능이 비활성화됩니다.")
+# 모듈 import (fallback 포함)
+try:
+    from credential_manager import CredentialManager
+except ImportError as e:
+    print(f"⚠️ credential_manager 로드 실패: {e}", file=sys.stderr)
+    print("📝 인증정보 암호화 기능이 비활성화됩니다.", file=sys.stderr)
+    CredentialManager = None
+
+try:
+    from discord_notifier import NotificationManager, run_notification as _run_notification
+except ImportError as e:
+    print(f"⚠️ discord_notifier 로드 실패: {e}", file=sys.stderr)
+    print("📝 알림 기능이 비활성화됩니다.", file=sys.stderr)
+    NotificationManager, _run_notification = None, None
+
+class _NullNotifier:
+    """알림 비활성화 시 사용하는 no-op 알림 관리자 (모든 notify_* 호출이 None 반환)"""
+    
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: None
+
+def run_notification(coro):
+    """알림 실행 - 알림이 비활성화된 경우(None) 무시"""
+    if coro is not None and _run_notification:
+        _run_notification(coro)
+
+@functools.lru_cache(maxsize=4)
+def _read_json_cached(path, mtime_ns):
+    """JSON 파일 파싱 결과 캐시 (파일이 바뀌면 mtime이 달라져 다시 읽음)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _read_json(path):
+    """JSON 설정 파일 읽기 - 캐시된 결과를 호출자가 수정해도 안전하도록 복사본 반환"""
+    return copy.deepcopy(_read_json_cached(path, os.stat(path).st_mtime_ns))
+
+@functools.lru_cache(maxsize=4)
+def _read_env_cached(path, mtime_ns):
+    """.env 파일 파싱 결과 캐시"""
+    return parse_dotenv(path)
+
+def _read_env(path):
+    """.env 파일 읽기 (KEY → VALUE)"""
+    return dict(_read_env_cached(path, os.stat(path).st_mtime_ns))
+
+# 예치금 금액 후보 (콤마 포함 3자 이상)
+_BAL_RE = re.compile(r'[\d,]{3,}')
+
+# 예치금 후보 텍스트 수집 - 우선순위 순서 ('예치금' 옆 칸 → strong → td.ta_right)
+# 금액 형태('1,000원')인 텍스트만 돌려주므로 Python으로 넘어오는 목록이 작다
+BALANCE_SCAN_JS = r"""
+    const texts = [];
+    for (const cell of document.querySelectorAll('td, th')) {
+        if (cell.innerText.includes('예치금') && cell.nextElementSibling) {
+            texts.push(cell.nextElementSibling.innerText);
+        }
+    }
+    for (const el of document.querySelectorAll('strong, td.ta_right')) {
+        texts.push(el.innerText);
+    }
+    return texts.filter(t => /[\d,]{3,}\s*원/.test(t));
+"""
+
+# find_element_robust 선택자 → CSS 변환 (ID/Name/CSS만 지원, 키는 By.ID/By.NAME/By.CSS_SELECTOR 값)
+_BY_TO_CSS = {
+    "id": "#{}",
+    "name": "[name='{}']",
+    "css selector": "{}",
+}
+
+# 우선순위 순서대로 첫 번째로 존재하는 요소 반환
+FIRST_MATCH_JS = """
+    for (const sel of arguments[0]) {
+        const el = document.querySelector(sel);
+        if (el) return el;
+    }
+    return null;
+"""
+
+# 구매 확인 버튼 (closepopupLayerConfirm 호출 실패 시) - 문서 순서상 첫 번째 일치 요소
+CONFIRM_BUTTON_CSS = "input[value='확인'], button.confirm-btn"
+
+# 구매 요일 (월, 목)
+PURCHASE_WEEKDAYS = (0, 3)
 
-notification_result = safe_import('discord_notifier', "알림 기능이 비활성화됩니다.")
-if notification_result:
-    NotificationManager, run_notification = notification_result
-else:
-    NotificationManager, run_notification = None, None
+# HTTP 직접 구매 (options.direct_purchase) - 게임 유형별 genType
+DIRECT_BUY_URL = "https://ol.dhlottery.co.kr/olotto/game/execBuy.do"
+DIRECT_READY_URL = "https://ol.dhlottery.co.kr/olotto/game/egovUserReadySocket.json"
+DIRECT_GEN_TYPES = {'자동': '0', '수동': '1', '반자동': '2'}
+DIRECT_SLOTS = "ABCDE"
+
+# 헤드리스 모드에서 CDP로 차단할 리소스 (CSS는 요소 표시 여부 판단에 필요하므로 유지)
+BLOCKED_RESOURCE_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.mp3",
+    "*google-analytics*", "*googletagmanager*", "*analytics*",
+]
 
 class LottoStatistics:
-    """로또 통계 분석 클래스"""
+    """로또 통계 분석 클래스
+    
+    당첨번호 데이터는 프로세스 동안 바뀌지 않으므로 결정적 통계(최다/최소/핫 번호)는
+    인스턴스에 인자별로 캐시하고, 랜덤/AI 추천만 매번 새로 계산한다.
+    """
     
     def __init__(self):
         self.winning_numbers_file = "winning_numbers.json"
-        self.winning_numbers = self.load_winning_numbers()
+        self.winning_numbers_cache = "winning_numbers.npy"
+        _load_numpy()
+        # (N, 6) 당첨번호 배열 - 빈도 통계는 모두 이 배열에서 계산
+        self._arr = self.load_winning_numbers()
+        self._memo = {}  # (통계 이름, 인자) → 결과 튜플
+        
+    @functools.cached_property
+    def freq(self):
+        """번호별 전체 출현 횟수 (인덱스 = 번호, 0은 미사용)"""
+        return np.bincount(self._arr.ravel(), minlength=46)
+    
+    def _cached(self, key, compute):
+        """결정적 통계 결과 캐시 - 호출자가 수정해도 캐시가 바뀌지 않도록 매번 새 리스트 반환"""
+        result = self._memo.get(key)
+        if result is None:
+            result = self._memo[key] = tuple(compute())
+        return list(result)
+    
+    @staticmethod
+    def _top_numbers(counts, count):
+        """출현 횟수 상위 번호 (동률은 작은 번호 우선, 미출현 번호 제외)"""
+        order = np.argsort(-counts[1:], kind='stable')[:count] + 1
+        return [int(num) for num in order if counts[num] > 0]
+        
+    @staticmethod
+    def _to_array(winning_numbers):
+        """당첨번호 JSON 목록 → (N, 6) 배열"""
+        return np.array(
+            [draw['numbers'] for draw in winning_numbers if 'numbers' in draw],
+            dtype=np.int8
+        ).reshape(-1, 6)
+    
+    def _save_cache(self, arr):
+        """런타임용 .npy 캐시 저장 (JSON은 사람이 보는 원본으로 유지)"""
+        try:
+            np.save(self.winning_numbers_cache, arr, allow_pickle=False)
+        except Exception as e:
+            print(f"⚠️ 당첨번호 캐시 저장 실패: {e}")
         
     def load_winning_numbers(self):
-        """저장된 당첨번호 불러오기"""
+        """저장된 당첨번호 불러오기 - JSON보다 최신인 .npy 캐시가 있으면 mmap으로 사용"""
+        try:
+            json_mtime = os.path.getmtime(self.winning_numbers_file)
+        except OSError:
+            json_mtime = 0
+        
+        try:
+            if os.path.getmtime(self.winning_numbers_cache) >= json_mtime:
+                return np.load(self.winning_numbers_cache, mmap_mode='r', allow_pickle=False)
+        except (OSError, ValueError):
+            pass
+        
         try:
             with open(self.winning_numbers_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                arr = self._to_array(json.load(f))
         except FileNotFoundError:
             return self.create_sample_winning_numbers()
+        
+        self._save_cache(arr)
+        return arr
             
     def create_sample_winning_numbers(self):
         """샘플 당첨번호 생성"""
-        sample_data = []
-        for i in range(50):
-            numbers = sorted(random.sample(range(1, 46), 6))
-            sample_data.append({
+        # 50회분을 한 번에 생성 - 행마다 1~45를 섞어 앞 6개를 정렬
+        rng = np.random.default_rng()
+        pool = np.tile(np.arange(1, 46, dtype=np.int8), (50, 1))
+        arr = np.sort(rng.permuted(pool, axis=1)[:, :6], axis=1)
+        
+        sample_data = [
+            {
                 'round': 1000 + i,
                 'numbers': numbers,
                 'date': f"2024-{(i%12)+1:02d}-{(i%28)+1:02d}"
-            })
+            }
+            for i, numbers in enumerate(arr.tolist())
+        ]
         
         try:
             with open(self.winning_numbers_file, 'w', encoding='utf-8') as f:
@@ -91,70 +251,33 @@ class LottoStatistics:
         except Exception as e:
             print(f"⚠️ 샘플 데이터 저장 실패: {e}")
         
-        return sample_data
+        self._save_cache(arr)
+        return arr
             
     def get_most_frequent_numbers(self, count=6):
         """가장 자주 나온 번호들"""
-        if not self.winning_numbers:
+        if self._arr.size == 0:
             return sorted(random.sample(range(1, 46), count))
-            
-        all_numbers = []
-        for draw in self.winning_numbers:
-            if 'numbers' in draw:
-                all_numbers.extend(draw['numbers'])
-                
-        if not all_numbers:
-            return sorted(random.sample(range(1, 46), count))
-                
-        counter = Counter(all_numbers)
-        most_common = counter.most_common(count)
-        return [num for num, freq in most_common]
+        
+        return self._cached(('most', count), lambda: self._top_numbers(self.freq, count))
         
     def get_ai_recommended_numbers(self):
-        """AI 추천 번호 - numpy 의존성 제거"""
-        if not self.winning_numbers:
+        """AI 추천 번호 - 최근 빈도 가중치 기반 추출"""
+        if self._arr.size == 0:
             return sorted(random.sample(range(1, 46), 6))
             
-        # 최근 10회 추첨 분석
-        recent_draws = self.winning_numbers[-10:] if len(self.winning_numbers) >= 10 else self.winning_numbers
-        recent_numbers = []
-        
-        for i, draw in enumerate(recent_draws):
-            if 'numbers' in draw:
-                weight = (i + 1)  # 최근일수록 가중치 높음
-                recent_numbers.extend(draw['numbers'] * weight)
-                
-        if not recent_numbers:
-            return sorted(random.sample(range(1, 46), 6))
+        # 최근 10회 추첨 분석 (최근일수록 가중치 높음)
+        recent = self._arr[-10:]
+        draw_weights = np.repeat(np.arange(1, len(recent) + 1), recent.shape[1])
+        recent_freq = np.bincount(recent.ravel(), weights=draw_weights, minlength=46)
                 
-        # 빈도 기반 가중치 계산
-        counter = Counter(recent_numbers)
-        numbers = list(range(1, 46))
-        weighted_numbers = []
-        
-        for num in numbers:
-            freq = counter.get(num, 0)
-            if freq == 0:
-                weight = 1  # 나오지 않은 번호는 기본 가중치
-            elif freq <= 3:
-                weight = 3  # 적게 나온 번호는 높은 가중치
-            elif freq <= 6:
-                weight = 2  # 보통 나온 번호는 중간 가중치
-            else:
-                weight = 1  # 많이 나온 번호는 낮은 가중치
-            
-            weighted_numbers.extend([num] * weight)
-        
-        # 가중치 기반 랜덤 선택
-        selected = set()
-        while len(selected) < 6 and weighted_numbers:
-            selected.add(random.choice(weighted_numbers))
+        # 빈도 기반 가중치 계산 (0회: 1, 1~3회: 3, 4~6회: 2, 그 이상: 1)
+        freq = recent_freq[1:]
+        weights = np.select([freq == 0, freq <= 3, freq <= 6], [1, 3, 2], default=1)
         
-        # 부족한 경우 일반 랜덤으로 채우기
-        while len(selected) < 6:
-            selected.add(random.randint(1, 45))
-            
-        return sorted(list(selected)[:6])
+        # 가중치 기반 비복원 추출
+        selected = np.random.choice(np.arange(1, 46), size=6, replace=False, p=weights / weights.sum())
+        return sorted(int(num) for num in selected)
     
     def get_random_numbers(self):
         """완전 랜덤 번호"""
@@ -162,49 +285,45 @@ class LottoStatistics:
     
     def get_least_frequent_numbers(self, count=6):
         """가장 적게 나온 번호들"""
-        if not self.winning_numbers:
+        if self._arr.size == 0:
             return sorted(random.sample(range(1, 46), count))
-            
-        all_numbers = []
-        for data in self.winning_numbers:
-            if 'numbers' in data:
-                all_numbers.extend(data['numbers'])
         
-        if not all_numbers:
-            return sorted(random.sample(range(1, 46), count))
-            
-        counter = Counter(all_numbers)
-        least_common = counter.most_common()[-count:] if len(counter.most_common()) >= count else counter.most_common()
-        return [num for num, _ in least_common]
+        return self._cached(('least', count), lambda: self._least_numbers(count))
+    
+    def _least_numbers(self, count):
+        """한 번이라도 나온 번호 중 출현 횟수 하위"""
+        freq = self.freq[1:]
+        drawn = np.flatnonzero(freq)
+        least = drawn[np.argsort(freq[drawn], kind='stable')[:count]] + 1
+        return [int(num) for num in least]
     
     def get_hot_numbers(self, recent_count=10):
         """최근 자주 나온 번호들"""
-        if not self.winning_numbers:
+        recent = self._arr[-recent_count:]
+        if recent.size == 0:
             return sorted(random.sample(range(1, 46), 6))
-            
-        recent_numbers = []
-        for data in self.winning_numbers[-recent_count:]:
-            if 'numbers' in data:
-                recent_numbers.extend(data['numbers'])
         
-        if not recent_numbers:
-            return sorted(random.sample(range(1, 46), 6))
-            
-        counter = Counter(recent_numbers)
-        hot = counter.most_common(6)
-        return [num for num, _ in hot]
+        return self._cached(('hot', recent_count),
+                            lambda: self._top_numbers(np.bincount(recent.ravel(), minlength=46), 6))
 
 class TabEnterLottoBuyer:
     """TAB + ENTER 방식 완전 자동화 로또 구매 클래스"""
     
-    def __init__(self):
-        """초기화 - 모든 설정을 환경변수나 파일에서 로드"""
+    def __init__(self, load_modules=True):
+        """초기화 - 모든 설정을 환경변수나 파일에서 로드
+        
+        load_modules=False면 알림/자동충전 모듈을 초기화하지 않음 (설정 확인/테스트 모드용)
+        """
         self.config = self.load_config()
-        self.statistics = LottoStatistics()
         self.auto_recharger = None
-        self.notification_manager = None
+        self.notification_manager = _NullNotifier()
         self.screenshot_dir = "screenshots"
         self.driver = None
+        self._waits = {}  # timeout → WebDriverWait (드라이버별 재사용)
+        self._shutdown = False
+        
+        # 정상 종료 시 드라이버 정리
+        atexit.register(self.cleanup)
         
         # 신호 핸들러 설정 (도커에서 안전한 종료를 위해)
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -217,17 +336,44 @@ class TabEnterLottoBuyer:
         self.setup_logging()
         
         # 외부 모듈 초기화
-        self._init_external_modules()
+        if load_modules:
+            self._init_external_modules()
     
-    def _signal_handler(self, signum, frame):
-        """신호 핸들러 - 안전한 종료"""
-        self.logger.info(f"📡 신호 수신: {signum}, 안전하게 종료합니다...")
+    @functools.cached_property
+    def statistics(self):
+        """번호 생성용 통계 (numpy 로드를 실제 번호 생성 시점까지 미룸)"""
+        return LottoStatistics()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.cleanup()
+        return False
+    
+    def cleanup(self):
+        """드라이버 정리 (여러 번 호출해도 안전)"""
         if self.driver:
             try:
                 self.driver.quit()
             except:
                 pass
-        sys.exit(0)
+            self.driver = None
+    
+    def _signal_handler(self, signum, frame):
+        """신호 핸들러 - 즉시 종료
+        
+        headless Chrome에서 quit RPC는 수 초간 멈출 수 있어 도커의 SIGKILL 유예시간을
+        넘기기 쉽다. chromedriver 프로세스를 직접 종료하고 바로 빠져나간다.
+        """
+        self.logger.info(f"📡 신호 수신: {signum}, 종료합니다...")
+        self._shutdown = True
+        if self.driver:
+            try:
+                self.driver.service.process.kill()
+            except Exception:
+                pass
+        os._exit(0)
     
     def _create_directories(self):
         """필요한 디렉토리 생성"""
@@ -242,9 +388,7 @@ class TabEnterLottoBuyer:
         
         # 1. JSON 파일에서 기본 설정 로드
         try:
-            with open('lotto_config.json', 'r', encoding='utf-8') as f:
-                file_config = json.load(f)
-                config.update(file_config)
+            config.update(_read_json('lotto_config.json'))
         except Exception as e:
             print(f"⚠️ 설정 파일 로드 실패: {e}, 기본 설정 사용")
         
@@ -279,7 +423,8 @@ class TabEnterLottoBuyer:
                 "save_screenshot": True,
                 "headless": True,  # 도커 환경 기본값
                 "wait_time": 2,
-                "retry_count": 3
+                "retry_count": 3,
+                "direct_purchase": False  # HTTP 직접 구매 (실패 시 Selenium)
             }
         }
     
@@ -315,6 +460,9 @@ class TabEnterLottoBuyer:
         if os.getenv('LOTTO_SCREENSHOT'):
             config['options']['save_screenshot'] = os.getenv('LOTTO_SCREENSHOT').lower() == 'true'
         
+        if os.getenv('LOTTO_DIRECT_PURCHASE'):
+            config['options']['direct_purchase'] = os.getenv('LOTTO_DIRECT_PURCHASE').lower() == 'true'
+        
         # 도커 환경 감지
         if os.getenv('DOCKER_ENV') or os.path.exists('/.dockerenv'):
             config['options']['headless'] = True
@@ -346,13 +494,7 @@ class TabEnterLottoBuyer:
         
         # 3. .env 파일에서 시도
         if os.path.exists('.env'):
-            env_vars = {}
-            with open('.env', 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        env_vars[key.strip()] = value.strip()
+            env_vars = _read_env('.env')
             
             if env_vars.get('LOTTO_USER_ID') and env_vars.get('LOTTO_PASSWORD'):
                 print("🔐 .env 파일에서 인증정보 로드")
@@ -388,10 +530,11 @@ class TabEnterLottoBuyer:
                 print("✅ 알림 서비스 초기화 완료")
             except Exception as e:
                 print(f"⚠️ 알림 서비스 초기화 실패: {e}")
-                self.notification_manager = None
+                self.notification_manager = _NullNotifier()
         
         # AutoRecharger 초기화
-        if AutoRecharger and self.config['payment'].get('auto_recharge'):
+        AutoRecharger = _load_auto_recharger() if self.config['payment'].get('auto_recharge') else None
+        if AutoRecharger:
             try:
                 self.auto_recharger = AutoRecharger(self.config)
                 print("✅ 자동충전 기능 활성화")
@@ -419,6 +562,7 @@ class TabEnterLottoBuyer:
     def setup_driver(self):
         """Chrome 드라이버 설정 - 도커 최적화"""
         try:
+            _load_selenium()
             options = Options()
             
             # 기본 옵션
@@ -427,6 +571,9 @@ class TabEnterLottoBuyer:
             options.add_experimental_option("excludeSwitches", ["enable-automation"])
             options.add_experimental_option('useAutomationExtension', False)
             
+            # DOMContentLoaded 시점에 driver.get 반환 (필요한 요소는 WebDriverWait로 대기)
+            options.page_load_strategy = 'eager'
+            
             # 도커/헤드리스 환경 옵션
             if self.config['options']['headless']:
                 options.add_argument('--headless=new')  # 새로운 헤드리스 모드
@@ -435,29 +582,47 @@ class TabEnterLottoBuyer:
                 options.add_argument('--disable-dev-shm-usage')
                 options.add_argument('--disable-extensions')
                 options.add_argument('--disable-plugins')
-                options.add_argument('--disable-images')  # 이미지 로딩 비활성화로 속도 향상
                 options.add_argument('--window-size=1920,1080')
+                # 이미지 로딩/디코딩 비활성화 (--disable-images는 최신 Chrome에서 무시됨)
+                options.add_argument('--blink-settings=imagesEnabled=false')
+                options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+                
+                # 불필요한 렌더러/백그라운드 작업 제거
+                options.add_argument('--disable-features=TranslateUI,BlinkGenPropertyTrees')
+                options.add_argument('--disable-background-networking')
+                options.add_argument('--no-first-run')
+                options.add_argument('--no-default-browser-check')
+                options.add_argument('--mute-audio')
                 
                 # 메모리 사용량 최적화
                 options.add_argument('--memory-pressure-off')
                 options.add_argument('--max_old_space_size=4096')
             
             # 도커에서 Selenium Grid 사용 시
+            # keep_alive: chromedriver/Grid와의 HTTP 연결을 명령 간에 재사용
             selenium_grid_url = os.getenv('SELENIUM_GRID_URL')
             if selenium_grid_url:
-                from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
                 self.driver = webdriver.Remote(
                     command_executor=selenium_grid_url,
-                    desired_capabilities=DesiredCapabilities.CHROME,
-                    options=options
+                    options=options,
+                    keep_alive=True
                 )
                 print("🕸️ Selenium Grid 연결 완료")
             else:
-                self.driver = webdriver.Chrome(options=options)
+                self.driver = webdriver.Chrome(options=options, keep_alive=True)
+            self._waits = {}
             
             # 자동화 감지 회피
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
+            # 네트워크 레벨 리소스 차단 (이미지/폰트/미디어/분석 스크립트)
+            if self.config['options']['headless']:
+                try:
+                    self.driver.execute_cdp_cmd("Network.enable", {})
+                    self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_RESOURCE_URLS})
+                except Exception as e:
+                    self.logger.debug(f"CDP 리소스 차단 미지원: {e}")
+            
             # 타임아웃 설정
             self.driver.implicitly_wait(self.config['options'].get('wait_time', 2))
             self.driver.set_page_load_timeout(30)
@@ -469,23 +634,31 @@ class TabEnterLottoBuyer:
             self.logger.error(f"❌ 드라이버 초기화 실패: {e}")
             return False
     
+    def _wait(self, timeout=10):
+        """현재 드라이버용 WebDriverWait (timeout별로 한 번만 생성)"""
+        waiter = self._waits.get(timeout)
+        if waiter is None:
+            waiter = self._waits[timeout] = WebDriverWait(self.driver, timeout)
+        return waiter
+    
     def find_element_robust(self, selectors, description, timeout=10):
-        """여러 선택자를 시도해서 요소 찾기"""
+        """여러 선택자를 시도해서 요소 찾기
+        
+        모든 선택자를 CSS로 바꿔 한 번의 대기로 함께 확인한다. 단순 CSS 합집합(a, b)은
+        문서 순서로 매칭되므로, 선택자 우선순위를 지키도록 스크립트에서 순서대로 조회한다.
+        """
         self.logger.debug(f"🔍 {description} 찾는 중...")
+        css_selectors = [_BY_TO_CSS[by_type].format(selector) for by_type, selector, _ in selectors]
         
-        for i, (by_type, selector, desc) in enumerate(selectors):
-            try:
-                self.logger.debug(f"  시도 {i+1}: {desc}")
-                element = WebDriverWait(self.driver, timeout).until(
-                    EC.presence_of_element_located((by_type, selector))
-                )
-                self.logger.debug(f"  ✅ 성공: {desc}")
-                return element
-                
-            except Exception:
-                continue
+        try:
+            element = self._wait(timeout).until(
+                lambda d: d.execute_script(FIRST_MATCH_JS, css_selectors)
+            )
+        except TimeoutException:
+            raise Exception(f"{description}를 모든 방법으로 찾을 수 없습니다.")
         
-        raise Exception(f"{description}를 모든 방법으로 찾을 수 없습니다.")
+        self.logger.debug(f"  ✅ 성공: {description}")
+        return element
     
     def login(self):
         """TAB + ENTER 방식 로그인 - 자동화"""
@@ -494,12 +667,11 @@ class TabEnterLottoBuyer:
             password = self.config['login']['password']
             
             # 로그인 시작 알림
-            if self.notification_manager:
-                run_notification(self.notification_manager.notify_login_start(user_id))
+            run_notification(self.notification_manager.notify_login_start(user_id))
             
             self.logger.info("🔐 TAB + ENTER 로그인 시작")
-            self.driver.get("https://www.dhlottery.co.kr/user.do?method=login")
-            time.sleep(3)
+            login_url = "https://www.dhlottery.co.kr/user.do?method=login"
+            self.driver.get(login_url)
             
             # ID 입력 필드 찾기 (검증된 방식)
             id_selectors = [
@@ -529,12 +701,15 @@ class TabEnterLottoBuyer:
             
             # TAB + ENTER 방식으로 로그인 (검증된 방식)
             self.logger.info("🔄 TAB + ENTER 로그인 실행...")
+            before_url = self.driver.current_url  # 리다이렉트 등으로 요청 URL과 다를 수 있음
             pw_input.send_keys(Keys.TAB)
-            time.sleep(1)  # 포커스 이동 대기
             pw_input.send_keys(Keys.ENTER)
             
-            # 로그인 처리 대기
-            time.sleep(5)
+            # 로그인 처리 대기 (실제로 열려 있던 로그인 페이지를 벗어날 때까지)
+            try:
+                self._wait(5).until(EC.url_changes(before_url))
+            except TimeoutException:
+                self.logger.debug("로그인 후 URL 변경 없음 - 페이지 내용으로 확인")
             
             # 로그인 성공 확인
             current_url = self.driver.current_url
@@ -561,15 +736,13 @@ class TabEnterLottoBuyer:
             if login_success:
                 self.logger.info("🎉 TAB + ENTER 로그인 성공!")
                 
-                if self.notification_manager:
-                    run_notification(self.notification_manager.notify_login_success(user_id))
+                run_notification(self.notification_manager.notify_login_success(user_id))
                 
                 return True
             else:
                 self.logger.error("❌ 로그인 실패")
                 
-                if self.notification_manager:
-                    run_notification(self.notification_manager.notify_login_failure(user_id, "TAB + ENTER 로그인 실패"))
+                run_notification(self.notification_manager.notify_login_failure(user_id, "TAB + ENTER 로그인 실패"))
                 
                 return False
                 
@@ -581,42 +754,24 @@ class TabEnterLottoBuyer:
         """잔액 확인 - 자동화 (사용자 입력 제거)"""
         try:
             self.driver.get("https://www.dhlottery.co.kr/myPage.do?method=myPage")
-            time.sleep(3)
-            
-            # 예치금 찾기 (향상된 방법)
-            balance_selectors = [
-                (By.XPATH, "//td[contains(text(), '예치금')]/following-sibling::td[contains(text(), '원')]"),
-                (By.XPATH, "//strong[contains(text(), '원') and contains(text(), ',')]"),
-                (By.XPATH, "//td[@class='ta_right' and contains(text(), '원')]"),
-                (By.CSS_SELECTOR, "td.ta_right"),
-                (By.XPATH, "//*[contains(text(), '원') and string-length(text()) > 3 and string-length(text()) < 20]"),
-            ]
             
-            for i, (selector_type, selector) in enumerate(balance_selectors):
-                try:
-                    elements = self.driver.find_elements(selector_type, selector)
-                    for element in elements:
-                        text = element.text.strip()
-                        if not text:
-                            continue
+            # 예치금 찾기 - 금액 텍스트가 나타날 때까지 스크립트 한 번으로 수집 (고정 대기 없음)
+            try:
+                texts = self._wait(5).until(lambda d: d.execute_script(BALANCE_SCAN_JS))
+            except TimeoutException:
+                texts = []
+            
+            for text in texts:
+                for number_str in _BAL_RE.findall(text):
+                    clean_number = number_str.replace(',', '')
+                    if clean_number.isdigit() and len(clean_number) >= 3:
+                        balance = int(clean_number)
+                        if 0 <= balance <= 50000000:  # 5천만원 이하
+                            self.logger.info(f"✅ 예치금 발견: {balance:,}원")
                             
-                        # 숫자 추출 및 검증
-                        import re
-                        numbers = re.findall(r'[\d,]+', text)
-                        
-                        for number_str in numbers:
-                            clean_number = number_str.replace(',', '')
-                            if clean_number.isdigit() and len(clean_number) >= 3:
-                                balance = int(clean_number)
-                                if 0 <= balance <= 50000000:  # 5천만원 이하
-                                    self.logger.info(f"✅ 예치금 발견: {balance:,}원")
-                                    
-                                    if self.notification_manager:
-                                        run_notification(self.notification_manager.notify_balance_check(balance))
-                                    
-                                    return balance
-                except Exception:
-                    continue
+                            run_notification(self.notification_manager.notify_balance_check(balance))
+                            
+                            return balance
             
             # 모든 방법 실패시 0원 반환 (사용자 입력 요청하지 않음)
             self.logger.warning("⚠️ 예치금을 찾을 수 없습니다. 0원으로 설정")
@@ -681,25 +836,23 @@ class TabEnterLottoBuyer:
             self.logger.info("🎯 구매 페이지 설정...")
             self.driver.get("https://ol.dhlottery.co.kr/olotto/game/game645.do")
             
-            WebDriverWait(self.driver, 15).until(
+            self._wait(15).until(
                 EC.presence_of_element_located((By.ID, "amoundApply"))
             )
             
             # 혼합선택 탭 활성화
             try:
                 self.driver.execute_script("selectWayTab(0);")
-                time.sleep(1)
             except Exception as e:
                 self.logger.debug(f"탭 활성화 실패: {e}")
             
             # 적용수량 설정
-            amount_select = WebDriverWait(self.driver, 10).until(
+            amount_select = self._wait(10).until(
                 EC.presence_of_element_located((By.ID, "amoundApply"))
             )
             select_obj = Select(amount_select)
             select_obj.select_by_value(str(purchase_count))
             self.logger.info(f"✅ 수량 {purchase_count} 설정")
-            time.sleep(1)
             return True
                     
         except Exception as e:
@@ -709,37 +862,60 @@ class TabEnterLottoBuyer:
     def click_number_enhanced(self, number):
         """번호 클릭"""
         try:
-            checkbox = WebDriverWait(self.driver, 5).until(
+            checkbox = self._wait(5).until(
                 EC.presence_of_element_located((By.ID, f"check645num{number}"))
             )
             
             if not checkbox.is_selected():
                 self.driver.execute_script("arguments[0].click();", checkbox)
-                time.sleep(0.3)
-                return True
+                self._wait(2).until(EC.element_to_be_selected(checkbox))
             return True
                         
         except Exception as e:
             self.logger.debug(f"번호 {number} 클릭 실패: {e}")
             return False
 
+    def click_numbers(self, numbers):
+        """번호 일괄 선택 - JS 한 번으로 체크 후 실패한 번호만 개별 클릭"""
+        missing = self.driver.execute_script("""
+            const missing = [];
+            for (const n of arguments[0]) {
+                const cb = document.getElementById('check645num' + n);
+                if (cb && !cb.checked) cb.click();
+                if (!cb || !cb.checked) missing.push(n);
+            }
+            return missing;
+        """, [int(num) for num in numbers])
+        
+        for num in missing:
+            self.click_number_enhanced(num)
+
+    def _wait_selection_applied(self, timeout=2):
+        """선택 확인 후 번호판이 초기화될 때까지 대기 (선택 내역 반영 확인)"""
+        try:
+            self._wait(timeout).until(lambda d: d.execute_script(
+                "return !document.querySelector(\"input[id^='check645num']:checked\")"
+                " && !document.getElementById('checkAutoSelect').checked;"
+            ))
+        except TimeoutException:
+            self.logger.debug("번호판 초기화 확인 실패 - 계속 진행")
+
     def select_auto_numbers(self):
         """자동 번호 선택"""
         try:
-            auto_checkbox = WebDriverWait(self.driver, 10).until(
+            auto_checkbox = self._wait(10).until(
                 EC.presence_of_element_located((By.ID, "checkAutoSelect"))
             )
             
             if not auto_checkbox.is_selected():
                 self.driver.execute_script("arguments[0].click();", auto_checkbox)
+                self._wait(2).until(EC.element_to_be_selected(auto_checkbox))
             
-            time.sleep(1)
-            
-            confirm_btn = WebDriverWait(self.driver, 10).until(
+            confirm_btn = self._wait(10).until(
                 EC.element_to_be_clickable((By.ID, "btnSelectNum"))
             )
             self.driver.execute_script("arguments[0].click();", confirm_btn)
-            time.sleep(2)
+            self._wait_selection_applied()
             return True
             
         except Exception as e:
@@ -749,23 +925,20 @@ class TabEnterLottoBuyer:
     def select_semi_auto_numbers(self, numbers):
         """반자동 번호 선택"""
         try:
-            for num in numbers:
-                self.click_number_enhanced(num)
-                time.sleep(0.5)
+            self.click_numbers(numbers)
             
-            auto_checkbox = WebDriverWait(self.driver, 5).until(
+            auto_checkbox = self._wait(5).until(
                 EC.presence_of_element_located((By.ID, "checkAutoSelect"))
             )
             if not auto_checkbox.is_selected():
                 self.driver.execute_script("arguments[0].click();", auto_checkbox)
+                self._wait(2).until(EC.element_to_be_selected(auto_checkbox))
             
-            time.sleep(1)
-            
-            confirm_btn = WebDriverWait(self.driver, 10).until(
+            confirm_btn = self._wait(10).until(
                 EC.element_to_be_clickable((By.ID, "btnSelectNum"))
             )
             self.driver.execute_script("arguments[0].click();", confirm_btn)
-            time.sleep(2)
+            self._wait_selection_applied()
             return True
             
         except Exception as e:
@@ -775,17 +948,13 @@ class TabEnterLottoBuyer:
     def select_manual_numbers(self, numbers):
         """수동 번호 선택"""
         try:
-            for num in numbers:
-                self.click_number_enhanced(num)
-                time.sleep(0.5)
-            
-            time.sleep(1)
+            self.click_numbers(numbers)
             
-            confirm_btn = WebDriverWait(self.driver, 10).until(
+            confirm_btn = self._wait(10).until(
                 EC.element_to_be_clickable((By.ID, "btnSelectNum"))
             )
             self.driver.execute_script("arguments[0].click();", confirm_btn)
-            time.sleep(2)
+            self._wait_selection_applied()
             return True
             
         except Exception as e:
@@ -795,12 +964,17 @@ class TabEnterLottoBuyer:
     def complete_purchase(self):
         """구매 완료"""
         try:
-            buy_btn = WebDriverWait(self.driver, 10).until(
+            buy_btn = self._wait(10).until(
                 EC.element_to_be_clickable((By.ID, "btnBuy"))
             )
             self.driver.execute_script("arguments[0].click();", buy_btn)
             self.logger.info("구매하기 버튼 클릭")
-            time.sleep(3)
+            
+            # 구매 확인 레이어가 뜰 때까지 대기
+            try:
+                self._wait(5).until(EC.visibility_of_element_located((By.ID, "popupLayerConfirm")))
+            except TimeoutException:
+                pass
             
             # 구매 확인
             try:
@@ -810,16 +984,16 @@ class TabEnterLottoBuyer:
                 confirmation_found = False
             
             if not confirmation_found:
+                # CSS 선택자 하나로 한 번만 대기 (XPath 텍스트 매칭은 CSS로 못 찾을 때만)
                 confirm_selectors = [
-                    "//input[@value='확인' and contains(@onclick, 'closepopupLayerConfirm(true)')]",
-                    "//input[@value='확인']",
-                    "//button[contains(text(), '확인')]"
+                    (By.CSS_SELECTOR, CONFIRM_BUTTON_CSS, 5),
+                    (By.XPATH, "//button[normalize-space()='확인']", 2)
                 ]
                 
-                for selector in confirm_selectors:
+                for by_type, selector, timeout in confirm_selectors:
                     try:
-                        confirm_btn = WebDriverWait(self.driver, 3).until(
-                            EC.element_to_be_clickable((By.XPATH, selector))
+                        confirm_btn = self._wait(timeout).until(
+                            EC.element_to_be_clickable((by_type, selector))
                         )
                         self.driver.execute_script("arguments[0].click();", confirm_btn)
                         confirmation_found = True
@@ -827,30 +1001,138 @@ class TabEnterLottoBuyer:
                     except:
                         continue
             
-            time.sleep(3)
+            # 구매 처리 완료 - 영수증 레이어 표시 대기
+            if confirmation_found:
+                try:
+                    self._wait(10).until(EC.visibility_of_element_located((By.ID, "popReceipt")))
+                except TimeoutException:
+                    self.logger.warning("⚠️ 구매 영수증 확인 실패")
+                    time.sleep(0.2)
+            
             return confirmation_found
             
         except Exception as e:
             self.logger.error(f"구매 완료 실패: {e}")
             return False
 
-    def buy_lotto_games(self, purchase_count):
-        """로또 구매 실행"""
+    def _get_purchase_info(self, lotto_list, index):
+        """index번째 게임의 구매 정보 (설정보다 많으면 마지막 설정 반복)"""
+        if index < len(lotto_list):
+            return lotto_list[index]
+        return lotto_list[-1] if lotto_list else {'type': '자동', 'numbers': []}
+
+    def _create_http_session(self):
+        """로그인된 브라우저 쿠키로 requests 세션 생성"""
+        import requests  # HTTP 직접 구매에서만 사용하므로 여기서 로드
+        session = requests.Session()
+        session.headers['User-Agent'] = self.driver.execute_script("return navigator.userAgent;")
+        for cookie in self.driver.get_cookies():
+            session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'))
+        return session
+
+    def buy_lotto_games_direct(self, tickets):
+        """HTTP 직접 구매 - 브라우저 렌더링 없이 execBuy.do로 최대 5게임씩 구매
+        
+        tickets: [(p_type, numbers), ...]
+        반환: (구매 성공 게임 수, Selenium으로 나머지 구매를 이어가도 되는지 여부)
+        """
+        # 직접 구매할 수 없는 유형이 나오면 그 앞까지만 HTTP로 구매하고 나머지는 Selenium에 맡김
+        gen_types = []
+        for p_type, _ in tickets:
+            gen_type = DIRECT_GEN_TYPES.get('수동' if '수동' in str(p_type) else p_type)
+            if gen_type is None:
+                self.logger.warning(f"⚠️ HTTP 직접 구매 불가 유형: {p_type} - 이후 게임은 Selenium 사용")
+                break
+            gen_types.append(gen_type)
+        
+        tickets = tickets[:len(gen_types)]
+        if not tickets:
+            return 0, True
+        
+        try:
+            # 구매 페이지를 한 번 열어 ol 도메인 세션 쿠키와 회차 정보 확보
+            self.driver.get("https://ol.dhlottery.co.kr/olotto/game/game645.do")
+            round_no = self._wait(15).until(
+                EC.presence_of_element_located((By.ID, "curRound"))
+            ).text.strip()
+            
+            session = self._create_http_session()
+            direct_ip = session.post(DIRECT_READY_URL, timeout=10).json()['ready_ip']
+        except Exception as e:
+            self.logger.warning(f"⚠️ HTTP 직접 구매 준비 실패 - Selenium 사용: {e}")
+            return 0, True
+        
+        bought = 0
+        for start in range(0, len(tickets), len(DIRECT_SLOTS)):
+            batch = tickets[start:start + len(DIRECT_SLOTS)]
+            param = []
+            for slot, gen_type, (_, numbers) in zip(DIRECT_SLOTS, gen_types[start:], batch):
+                param.append({
+                    'genType': gen_type,
+                    'arrGameChoiceNum': ','.join(str(num) for num in sorted(numbers)) or None,
+                    'alpabet': slot
+                })
+            
+            try:
+                response = session.post(DIRECT_BUY_URL, data={
+                    'round': round_no,
+                    'direct': direct_ip,
+                    'nBuyAmount': str(1000 * len(batch)),
+                    'param': json.dumps(param),
+                    'gameCnt': len(batch)
+                }, timeout=15)
+                result = response.json()['result']
+            except Exception as e:
+                # 요청 전송 후 결과를 알 수 없으면 중복 구매 방지를 위해 중단
+                self.logger.error(f"❌ HTTP 직접 구매 결과 확인 실패 - 구매 중단: {e}")
+                return bought, False
+            
+            if result.get('resultCode') != '100':
+                self.logger.warning(f"⚠️ HTTP 직접 구매 실패: {result.get('resultMsg')} - Selenium 사용")
+                return bought, True
+            
+            bought += len(batch)
+            self.logger.info(f"✅ HTTP 직접 구매 성공: {bought}/{len(tickets)}게임")
+        
+        return bought, True
+
+    def prepare_tickets(self, purchase_count):
+        """게임별 (유형, 번호) 목록 미리 생성 - 브라우저 작업 중 통계 계산으로 지연되지 않도록"""
+        lotto_list = self.config['purchase']['lotto_list']
+        tickets = []
+        for i in range(purchase_count):
+            purchase_info = self._get_purchase_info(lotto_list, i)
+            tickets.append((purchase_info['type'], self.get_purchase_numbers(purchase_info)))
+        return tickets
+
+    def buy_lotto_games(self, purchase_count, tickets=None):
+        """로또 구매 실행 (tickets가 없으면 여기서 생성)"""
         try:
             self.logger.info(f"🎯 구매 시작 ({purchase_count}게임)")
             
-            lotto_list = self.config['purchase']['lotto_list']
+            if tickets is None:
+                tickets = self.prepare_tickets(purchase_count)
+            options = self.config['options']
+            save_screenshot = options.get('save_screenshot', False)
+            run_stamp = datetime.now().strftime('%Y%m%d_%H%M%S')  # 게임 번호와 합쳐 파일명 고유
             success_count = 0
+            start_index = 0
+            
+            # 게임 유형별 번호 선택 함수 ('수동'이 포함된 유형은 수동 선택)
+            select_handlers = {
+                '자동': lambda numbers: self.select_auto_numbers(),
+                '반자동': self.select_semi_auto_numbers,
+            }
+            
+            if options.get('direct_purchase'):
+                success_count, can_fallback = self.buy_lotto_games_direct(tickets)
+                if not can_fallback:
+                    return success_count
+                start_index = success_count
             
-            for i in range(purchase_count):
+            for i in range(start_index, purchase_count):
                 try:
-                    if i < len(lotto_list):
-                        purchase_info = lotto_list[i]
-                    else:
-                        purchase_info = lotto_list[-1] if lotto_list else {'type': '자동', 'numbers': []}
-                    
-                    p_type = purchase_info['type']
-                    numbers = self.get_purchase_numbers(purchase_info)
+                    p_type, numbers = tickets[i]
                     
                     self.logger.info(f"🎮 [{i+1}] {p_type}: {numbers}")
                     
@@ -858,14 +1140,10 @@ class TabEnterLottoBuyer:
                         continue
                     
                     # 번호 선택
-                    if p_type == '자동':
-                        success = self.select_auto_numbers()
-                    elif p_type == '반자동':
-                        success = self.select_semi_auto_numbers(numbers)
-                    elif '수동' in p_type:
-                        success = self.select_manual_numbers(numbers)
-                    else:
-                        success = False
+                    handler = select_handlers.get(p_type)
+                    if handler is None and '수동' in p_type:
+                        handler = self.select_manual_numbers
+                    success = handler(numbers) if handler else False
                     
                     if not success:
                         continue
@@ -875,14 +1153,12 @@ class TabEnterLottoBuyer:
                         success_count += 1
                         self.logger.info(f"✅ [{i+1}] 구매 성공!")
                         
-                        if self.config['options'].get('save_screenshot'):
+                        if save_screenshot:
                             try:
-                                screenshot_path = f"screenshots/purchase_{i+1}_{datetime.now().strftime('%H%M%S')}.png"
+                                screenshot_path = f"screenshots/purchase_{i+1}_{run_stamp}.png"
                                 self.driver.save_screenshot(screenshot_path)
                             except:
                                 pass
-                        
-                        time.sleep(3)
                     else:
                         self.logger.warning(f"❌ [{i+1}] 구매 실패")
                         
@@ -896,16 +1172,33 @@ class TabEnterLottoBuyer:
             self.logger.error(f"구매 실패: {e}")
             return 0
 
-    def run(self, immediate=False):
-        """메인 실행 - 완전 자동화"""
+    def _is_driver_alive(self):
+        """재사용할 드라이버 세션이 살아있는지 확인"""
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def run(self, immediate=False, keep_driver=False):
+        """메인 실행 - 완전 자동화 (keep_driver=True면 실행 후 드라이버를 유지)"""
         try:
             self.logger.info("🚀 TAB + ENTER 방식 자동화 로또 구매 시작")
             
-            if self.notification_manager:
-                run_notification(self.notification_manager.notify_program_start())
+            # 구매 번호는 브라우저를 띄우기 전에 미리 생성
+            is_purchase_day = immediate or datetime.now().weekday() in PURCHASE_WEEKDAYS
+            purchase_count = self.config['purchase']['count']
+            payment_cfg = self.config['payment']
+            tickets = self.prepare_tickets(purchase_count) if is_purchase_day else None
             
-            # 드라이버 설정
-            if not self.setup_driver():
+            run_notification(self.notification_manager.notify_program_start())
+            
+            # 드라이버 설정 (스케줄 모드에서는 살아있는 드라이버 재사용)
+            if self.driver and not self._is_driver_alive():
+                self.logger.warning("⚠️ 기존 드라이버 세션 만료 - 재시작합니다")
+                self.cleanup()
+            
+            if not self.driver and not self.setup_driver():
                 raise Exception("드라이버 초기화 실패")
             
             # TAB + ENTER 로그인
@@ -916,22 +1209,21 @@ class TabEnterLottoBuyer:
             balance = self.check_balance()
             
             # 자동충전 처리
-            min_balance = self.config['payment'].get('min_balance', 5000)
+            min_balance = payment_cfg.get('min_balance', 5000)
             self.logger.info(f"💰 잔액: {balance:,}원, 최소: {min_balance:,}원")
             
             if balance < min_balance and self.auto_recharger:
-                if self.config['payment'].get('auto_recharge', False):
-                    recharge_amount = self.config['payment'].get('recharge_amount', 10000)
+                if payment_cfg.get('auto_recharge', False):
+                    recharge_amount = payment_cfg.get('recharge_amount', 10000)
                     
-                    if self.notification_manager:
-                        run_notification(self.notification_manager.notify_recharge_start(recharge_amount))
+                    run_notification(self.notification_manager.notify_recharge_start(recharge_amount))
                     
                     if self.auto_recharger.auto_recharge(self.driver, balance):
-                        self.logger.info("💳 충전 완료!")
-                        balance = self.check_balance()
+                        # 충전 전 잔액 + 충전 금액으로 갱신 (마이페이지 재조회 생략)
+                        balance += recharge_amount
+                        self.logger.info(f"💳 충전 완료! 예상 잔액: {balance:,}원")
                         
-                        if self.notification_manager:
-                            run_notification(self.notification_manager.notify_recharge_success(recharge_amount, balance))
+                        run_notification(self.notification_manager.notify_recharge_success(recharge_amount, balance))
                     else:
                         raise Exception("자동충전 실패")
                 else:
@@ -939,19 +1231,15 @@ class TabEnterLottoBuyer:
                         raise Exception("잔액 부족")
             
             # 로또 구매 (즉시 실행 또는 스케줄)
-            if immediate or datetime.now().weekday() in [0, 3]:
-                purchase_count = self.config['purchase']['count']
+            if is_purchase_day:
+                run_notification(self.notification_manager.notify_purchase_start(purchase_count))
                 
-                if self.notification_manager:
-                    run_notification(self.notification_manager.notify_purchase_start(purchase_count))
-                
-                success_count = self.buy_lotto_games(purchase_count)
+                success_count = self.buy_lotto_games(purchase_count, tickets)
                 
                 if success_count > 0:
                     self.logger.info(f"🎉 구매 완료: {success_count}/{purchase_count}")
                     
-                    if self.notification_manager:
-                        run_notification(self.notification_manager.notify_purchase_success(success_count, success_count * 1000))
+                    run_notification(self.notification_manager.notify_purchase_success(success_count, success_count * 1000))
                     
                     return True
                 else:
@@ -963,16 +1251,100 @@ class TabEnterLottoBuyer:
         except Exception as e:
             self.logger.error(f"❌ 실행 실패: {e}")
             
-            if self.notification_manager:
-                run_notification(self.notification_manager.notify_critical("시스템 실패", str(e)))
+            run_notification(self.notification_manager.notify_critical("시스템 실패", str(e)))
+            
+            # 실패한 세션은 다음 실행에서 새로 띄우도록 폐기
+            if keep_driver:
+                self.cleanup()
             
             return False
         finally:
-            if self.driver:
+            if not keep_driver:
+                self.cleanup()
+
+    def _next_purchase_slot(self, now=None):
+        """다음 구매 시각 계산 (월/목 + schedule.time)"""
+        now = now or datetime.now()
+        purchase_time = self.config.get('schedule', {}).get('time', '14:00')
+        hour, minute = (int(part) for part in purchase_time.split(':'))
+        
+        for days_ahead in range(8):
+            slot = (now + timedelta(days=days_ahead)).replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if slot.weekday() in PURCHASE_WEEKDAYS and slot > now:
+                return slot
+
+    def run_scheduled(self):
+        """스케줄 모드 - 프로세스와 드라이버를 유지한 채 월/목 구매 시각마다 실행 (cron 대체)
+        
+        Chrome 기동과 드라이버 핸드셰이크는 첫 실행에서만 발생하고, 드라이버는 종료 시 atexit로 정리된다.
+        """
+        self.logger.info("🕒 스케줄 모드 시작")
+        
+        while True:
+            next_slot = self._next_purchase_slot()
+            self.logger.info(f"⏳ 다음 구매 예정: {next_slot.strftime('%Y-%m-%d %H:%M')}")
+            time.sleep(max(0, (next_slot - datetime.now()).total_seconds()))
+            
+            self.run(immediate=True, keep_driver=True)
+
+    def run_serve(self, out=None):
+        """서비스 모드 - 브라우저 세션을 유지한 채 stdin JSON 명령으로 구매 실행
+        
+        명령 (한 줄에 하나): {"op": "buy", "count": 5}, {"op": "balance"}, {"op": "quit"}
+        결과는 out(기본 stdout)에 JSON 한 줄로 출력 (로그는 stderr)
+        """
+        out = out or sys.stdout
+        session_timeout = self.config.get('security', {}).get('session_timeout', 1800)
+        
+        try:
+            self.logger.info("🕒 서비스 모드 시작")
+            
+            if not self.setup_driver():
+                raise Exception("드라이버 초기화 실패")
+            
+            if not self.login():
+                raise Exception("TAB + ENTER 로그인 실패")
+            last_login = time.monotonic()
+            
+            for line in sys.stdin:
+                line = line.strip()
+                if not line:
+                    continue
+                
                 try:
-                    self.driver.quit()
-                except:
-                    pass
+                    command = json.loads(line)
+                except json.JSONDecodeError:
+                    self.logger.warning(f"⚠️ 잘못된 명령: {line}")
+                    continue
+                
+                op = command.get('op')
+                if op == 'quit':
+                    break
+                
+                # 세션 만료 전 재로그인 (브라우저는 재사용)
+                if time.monotonic() - last_login > session_timeout:
+                    if not self.login():
+                        raise Exception("TAB + ENTER 재로그인 실패")
+                    last_login = time.monotonic()
+                
+                if op == 'buy':
+                    purchase_count = int(command.get('count', self.config['purchase']['count']))
+                    success_count = self.buy_lotto_games(purchase_count)
+                    result = {'op': op, 'success': success_count, 'requested': purchase_count}
+                elif op == 'balance':
+                    result = {'op': op, 'balance': self.check_balance()}
+                else:
+                    result = {'op': op, 'error': '알 수 없는 명령'}
+                
+                print(json.dumps(result, ensure_ascii=False), file=out, flush=True)
+            
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"❌ 서비스 모드 실행 실패: {e}")
+            return False
+        finally:
+            self.cleanup()
 
 def main():
     """메인 함수 - 완전 자동화"""
@@ -980,28 +1352,42 @@ def main():
     parser.add_argument('--now', action='store_true', help='즉시 구매')
     parser.add_argument('--test', action='store_true', help='테스트 모드')
     parser.add_argument('--config', action='store_true', help='설정 확인')
+    parser.add_argument('--serve', action='store_true', help='서비스 모드 (브라우저 유지, stdin JSON 명령)')
+    parser.add_argument('--schedule', action='store_true', help='스케줄 모드 (브라우저 유지, 월/목 구매 시각마다 실행)')
     
     args = parser.parse_args()
     
     try:
         if args.config:
-            # 설정 확인만
-            buyer = TabEnterLottoBuyer()
+            # 설정 확인만 (브라우저/외부 모듈 로드 없음)
+            buyer = TabEnterLottoBuyer(load_modules=False)
             config_copy = buyer.config.copy()
             config_copy['login']['password'] = '***'
             print(json.dumps(config_copy, indent=2, ensure_ascii=False))
             return
         
         if args.test:
-            # 테스트 모드 (실제 구매 안함)
+            # 테스트 모드 (실제 구매 안함 - 자동충전 모듈이 Selenium/OCR을 import하므로 외부 모듈 로드 없음)
             print("🧪 테스트 모드 - 실제 구매하지 않음")
-            buyer = TabEnterLottoBuyer()
+            buyer = TabEnterLottoBuyer(load_modules=False)
             print("✅ TAB + ENTER 방식 초기화 완료")
             return
         
+        # 서비스 모드: 실제 stdout은 JSON 결과 전용으로 두고
+        # 초기화 메시지 등 나머지 print 출력은 모두 stderr로 보냄
+        protocol_out = sys.stdout
+        if args.serve:
+            sys.stdout = sys.stderr
+        
         # 실제 실행
-        buyer = TabEnterLottoBuyer()
-        success = buyer.run(immediate=args.now)
+        with TabEnterLottoBuyer() as buyer:
+            if args.schedule:
+                buyer.run_scheduled()
+                return
+            if args.serve:
+                success = buyer.run_serve(protocol_out)
+            else:
+                success = buyer.run(immediate=args.now)
         
         if success:
             print("✅ TAB + ENTER 방식 실행 성공")
@@ -7,8 +7,11 @@
 import sys
 import os
 import json
+import re
 import time
 import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -24,13 +27,31 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
+from dotenv_utils import parse_dotenv
+
+# 금액 텍스트에서 숫자 외 문자 (콤마, '원' 등) 제거용
+_NON_DIGIT_RE = re.compile(r'\D')
+
+@functools.lru_cache(maxsize=1)
+def _load_env(path='.env'):
+    """.env 파일을 한 번만 읽어 KEY → VALUE 딕셔너리로 반환 (없으면 빈 딕셔너리)"""
+    if not os.path.exists(path):
+        return {}
+    return parse_dotenv(path)
+
 class LottoFunctionTester:
     """로또 기본 기능 테스트 클래스"""
     
-    def __init__(self):
+    def __init__(self, configure_logging=True):
+        """configure_logging=False면 이미 설정된 로거만 사용 (병렬 실행용 작업자 - 로그 파일 핸들 중복 방지)"""
         self.driver = None
         self.test_results = {}
-        self.setup_logging()
+        # 기본은 헤드리스 (LOTTO_TEST_HEADLESS=0 이면 GUI 모드로 화면 확인)
+        self.headless = os.getenv('LOTTO_TEST_HEADLESS', '1') == '1'
+        if configure_logging:
+            self.setup_logging()
+        else:
+            self.logger = logging.getLogger(__name__)
         
     def setup_logging(self):
         """로깅 설정"""
@@ -54,20 +75,12 @@ class LottoFunctionTester:
             }
         
         # 2. .env 파일에서 시도
-        if os.path.exists('.env'):
-            env_vars = {}
-            with open('.env', 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        env_vars[key.strip()] = value.strip()
-            
-            if env_vars.get('LOTTO_USER_ID') and env_vars.get('LOTTO_PASSWORD'):
-                return {
-                    'user_id': env_vars['LOTTO_USER_ID'],
-                    'password': env_vars['LOTTO_PASSWORD']
-                }
+        env_vars = _load_env()
+        if env_vars.get('LOTTO_USER_ID') and env_vars.get('LOTTO_PASSWORD'):
+            return {
+                'user_id': env_vars['LOTTO_USER_ID'],
+                'password': env_vars['LOTTO_PASSWORD']
+            }
         
         # 3. 수동 입력
         print("🔐 테스트용 인증정보를 입력하세요:")
@@ -88,9 +101,16 @@ class LottoFunctionTester:
             options.add_experimental_option("excludeSwitches", ["enable-automation"])
             options.add_experimental_option('useAutomationExtension', False)
             
-            # 테스트는 GUI 모드로 실행 (문제 확인을 위해)
             options.add_argument('--window-size=1920,1080')
             
+            # 텍스트만 확인하는 테스트이므로 헤드리스 + 이미지 로드 생략
+            if self.headless:
+                options.add_argument('--headless=new')
+                options.add_argument('--blink-settings=imagesEnabled=false')
+                options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+            
+            # 암시적 대기는 사용하지 않음 (없는 요소 확인이 매번 대기 시간만큼 막히므로)
+            # 존재가 예상되는 요소만 짧은 명시적 대기로 확인
             self.driver = webdriver.Chrome(options=options)
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
@@ -116,7 +136,7 @@ class LottoFunctionTester:
             
             # ID 입력 필드 찾기 및 입력
             try:
-                id_input = WebDriverWait(self.driver, 10).until(
+                id_input = WebDriverWait(self.driver, 3).until(
                     EC.presence_of_element_located((By.ID, "userId"))
                 )
                 id_input.clear()
@@ -127,9 +147,7 @@ class LottoFunctionTester:
             
             # 비밀번호 입력 필드 찾기 및 입력
             try:
-                pw_input = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.ID, "password"))
-                )
+                pw_input = self.driver.find_element(By.ID, "password")
                 pw_input.clear()
                 pw_input.send_keys(password)
                 self.logger.info("  ✅ 비밀번호 입력 완료")
@@ -149,19 +167,27 @@ class LottoFunctionTester:
             # 로그인 결과 확인
             time.sleep(3)
             
-            if "마이페이지" in self.driver.page_source or "로그아웃" in self.driver.page_source:
+            # 페이지 소스 전체를 가져오지 않고 로그인 후에만 보이는 링크로 확인
+            logged_in = (
+                bool(self.driver.find_elements(By.LINK_TEXT, "로그아웃"))
+                or bool(self.driver.find_elements(By.PARTIAL_LINK_TEXT, "마이페이지"))
+            )
+            
+            if logged_in:
                 self.logger.info("  ✅ 로그인 성공 확인")
                 self.test_results[test_name] = {"status": "성공", "message": "정상 로그인"}
                 return True
             else:
                 # 오류 메시지 확인
                 try:
-                    error_elements = self.driver.find_elements(By.CSS_SELECTOR, ".error, .alert, .warning")
-                    error_msg = ""
-                    for element in error_elements:
-                        if element.text.strip():
-                            error_msg = element.text.strip()
-                            break
+                    # 텍스트가 있는 첫 번째 오류 요소를 한 번의 스크립트 호출로 확인
+                    error_msg = self.driver.execute_script("""
+                        for (const el of document.querySelectorAll(':is(.error, .alert, .warning)')) {
+                            const text = el.innerText.trim();
+                            if (text) return text;
+                        }
+                        return '';
+                    """)
                     
                     if not error_msg:
                         error_msg = "로그인 후 예상되는 요소를 찾을 수 없음"
@@ -186,11 +212,10 @@ class LottoFunctionTester:
             self.driver.get("https://www.dhlottery.co.kr/myPage.do?method=myPage")
             time.sleep(3)
             
-            # 예치금 찾기 시도
+            # 예치금 찾기 시도 (구체적인 선택자부터, 찾으면 즉시 중단 - 전체 문서 스캔은 최후 수단)
             balance_selectors = [
                 (By.XPATH, "//td[contains(text(), '예치금')]/following-sibling::td[contains(text(), '원')]"),
                 (By.XPATH, "//strong[contains(text(), '원') and contains(text(), ',')]"),
-                (By.XPATH, "//td[@class='ta_right' and contains(text(), '원') and not(contains(text(), '0 원'))]"),
                 (By.CSS_SELECTOR, "td.ta_right:not(:empty)"),
                 (By.XPATH, "//*[contains(text(), '원') and string-length(text()) > 3]")
             ]
@@ -209,8 +234,7 @@ class LottoFunctionTester:
                             self.logger.info(f"    - 요소 {j+1}: '{text}'")
                             
                             # 숫자 추출
-                            clean_text = ''.join(c for c in text if c.isdigit() or c == ',')
-                            clean_text = clean_text.replace(',', '')
+                            clean_text = _NON_DIGIT_RE.sub('', text)
                             
                             if clean_text.isdigit() and len(clean_text) >= 3:
                                 balance = int(clean_text)
@@ -277,9 +301,7 @@ class LottoFunctionTester:
             
             for element_id, description in required_elements:
                 try:
-                    element = WebDriverWait(self.driver, 5).until(
-                        EC.presence_of_element_located((By.ID, element_id))
-                    )
+                    self.driver.find_element(By.ID, element_id)
                     found_elements.append(description)
                     self.logger.info(f"  ✅ {description} 요소 확인")
                 except:
@@ -316,38 +338,34 @@ class LottoFunctionTester:
                 self.driver.get("https://ol.dhlottery.co.kr/olotto/game/game645.do")
                 time.sleep(3)
             
-            # 번호 선택 테스트 (1, 2, 3번 선택 시도)
+            # 번호 선택 테스트 (1, 2, 3번 선택 시도) - 한 번의 스크립트 호출로 일괄 처리
             test_numbers = [1, 2, 3]
             selected_numbers = []
             
-            for number in test_numbers:
-                try:
-                    # 체크박스 클릭 시도
-                    checkbox_id = f"check645num{number}"
-                    checkbox = WebDriverWait(self.driver, 5).until(
-                        EC.presence_of_element_located((By.ID, checkbox_id))
-                    )
-                    
-                    if checkbox.is_displayed() and checkbox.is_enabled():
-                        if not checkbox.is_selected():
-                            self.driver.execute_script("arguments[0].click();", checkbox)
-                            time.sleep(0.5)
-                            
-                            # 선택 확인
-                            if checkbox.is_selected():
-                                selected_numbers.append(number)
-                                self.logger.info(f"  ✅ 번호 {number} 선택 성공")
-                            else:
-                                self.logger.warning(f"  ⚠️ 번호 {number} 선택 실패")
-                        else:
-                            selected_numbers.append(number)
-                            self.logger.info(f"  ✅ 번호 {number} 이미 선택됨")
-                    else:
-                        self.logger.warning(f"  ❌ 번호 {number} 체크박스 비활성화")
-                        
-                except Exception as e:
-                    self.logger.warning(f"  ❌ 번호 {number} 선택 실패: {e}")
-                    continue
+            states = self.driver.execute_script("""
+                return arguments[0].map(function(n) {
+                    var cb = document.getElementById('check645num' + n);
+                    if (!cb) return 'missing';
+                    if (cb.disabled) return 'disabled';
+                    if (cb.checked) return 'already';
+                    cb.click();
+                    return cb.checked ? 'selected' : 'failed';
+                });
+            """, test_numbers)
+            
+            for number, state in zip(test_numbers, states):
+                if state == 'selected':
+                    selected_numbers.append(number)
+                    self.logger.info(f"  ✅ 번호 {number} 선택 성공")
+                elif state == 'already':
+                    selected_numbers.append(number)
+                    self.logger.info(f"  ✅ 번호 {number} 이미 선택됨")
+                elif state == 'disabled':
+                    self.logger.warning(f"  ❌ 번호 {number} 체크박스 비활성화")
+                elif state == 'missing':
+                    self.logger.warning(f"  ❌ 번호 {number} 체크박스를 찾을 수 없음")
+                else:
+                    self.logger.warning(f"  ⚠️ 번호 {number} 선택 실패")
             
             if selected_numbers:
                 self.test_results[test_name] = {
@@ -386,13 +404,15 @@ class LottoFunctionTester:
                 "결제"
             ]
             
-            page_text = self.driver.page_source
-            found_indicators = []
+            # 페이지 텍스트 검색은 브라우저에서 수행하고 찾은 키워드만 받음
+            found_indicators = self.driver.execute_script(
+                "var text = document.body.innerText;"
+                "return arguments[0].filter(function(k) { return text.indexOf(k) >= 0; });",
+                recharge_indicators
+            )
             
-            for indicator in recharge_indicators:
-                if indicator in page_text:
-                    found_indicators.append(indicator)
-                    self.logger.info(f"  ✅ '{indicator}' 관련 요소 발견")
+            for indicator in found_indicators:
+                self.logger.info(f"  ✅ '{indicator}' 관련 요소 발견")
             
             if found_indicators:
                 self.test_results[test_name] = {
@@ -430,24 +450,49 @@ class LottoFunctionTester:
             return False
         
         try:
-            # 테스트 실행
-            tests = [
-                ("로그인", lambda: self.test_login(credentials)),
-                ("잔액 확인", self.test_balance_check),
-                ("구매 페이지 접근", self.test_purchase_page_access),
-                ("번호 선택", self.test_number_selection),
-                ("자동충전 접근", self.test_auto_recharge_access)
-            ]
+            # 테스트 실행 - 로그인 후 서로 독립적인 페이지 테스트는 별도 브라우저에서 병렬 실행
+            test_order = ["로그인", "잔액 확인", "구매 페이지 접근", "번호 선택", "자동충전 접근"]
+            # 병렬 실행 테스트 (메서드 이름 → 테스트 이름)
+            parallel_tests = {
+                "test_balance_check": "잔액 확인",
+                "test_purchase_page_access": "구매 페이지 접근",
+                "test_auto_recharge_access": "자동충전 접근",
+            }
+            
+            print("\n📋 로그인 테스트...")
+            login_passed = self.test_login(credentials)
+            results = [login_passed]
             
-            passed_tests = 0
-            total_tests = len(tests)
+            if login_passed:
+                cookies = self.driver.get_cookies()
+                
+                print("\n📋 잔액 확인 / 구매 페이지 접근 / 자동충전 접근 테스트 (병렬)...")
+                with ThreadPoolExecutor(max_workers=len(parallel_tests)) as executor:
+                    futures = [
+                        executor.submit(self._run_in_new_browser, method_name, test_name, cookies)
+                        for method_name, test_name in parallel_tests.items()
+                    ]
+                    for future in futures:
+                        result, worker_results = future.result()
+                        results.append(result)
+                        self.test_results.update(worker_results)
+            else:
+                # 로그인 쿠키가 없으면 새 브라우저 테스트는 의미가 없으므로 실패로 기록
+                for test_name in parallel_tests.values():
+                    print(f"\n📋 {test_name} 테스트... 로그인 실패로 건너뜀")
+                    self.test_results[test_name] = {"status": "실패", "message": "로그인 실패로 실행하지 않음"}
+                    results.append(False)
+            
+            print("\n📋 번호 선택 테스트...")
+            results.append(self.test_number_selection())
+            
+            # 요약은 테스트 순서대로 출력
+            self.test_results = {
+                name: self.test_results[name] for name in test_order if name in self.test_results
+            }
             
-            for test_name, test_func in tests:
-                print(f"\n📋 {test_name} 테스트...")
-                result = test_func()
-                if result:
-                    passed_tests += 1
-                time.sleep(2)  # 테스트 간 간격
+            passed_tests = sum(1 for result in results if result)
+            total_tests = len(results)
             
             # 결과 출력
             self.print_test_summary(passed_tests, total_tests)
@@ -459,9 +504,39 @@ class LottoFunctionTester:
             return False
         finally:
             if self.driver:
-                input("\n🔍 브라우저를 확인하려면 Enter를 누르세요...")
+                if not self.headless:
+                    input("\n🔍 브라우저를 확인하려면 Enter를 누르세요...")
                 self.driver.quit()
     
+    def _run_in_new_browser(self, method_name, test_name, cookies):
+        """로그인 쿠키를 복사한 새 브라우저에서 테스트 하나 실행 (병렬 실행용)
+        
+        반환: (테스트 결과, 해당 테스트의 test_results) - 예외는 밖으로 보내지 않고 실패로 기록
+        """
+        worker = LottoFunctionTester(configure_logging=False)
+        if not worker.setup_driver():
+            return False, {test_name: {"status": "실패", "message": "드라이버 초기화 실패"}}
+        
+        try:
+            # 쿠키는 같은 도메인 페이지에서만 추가 가능
+            worker.driver.get("https://www.dhlottery.co.kr/")
+            for cookie in cookies:
+                try:
+                    worker.driver.add_cookie(cookie)
+                except Exception as e:
+                    self.logger.debug(f"쿠키 복사 실패 ({cookie.get('name')}): {e}")
+            
+            result = getattr(worker, method_name)()
+            return result, worker.test_results
+        except Exception as e:
+            self.logger.error(f"  ❌ {test_name} 실패: {e}")
+            return False, {test_name: {"status": "실패", "message": str(e)}}
+        finally:
+            try:
+                worker.driver.quit()
+            except Exception:
+                pass
+    
     def print_test_summary(self, passed, total):
         """테스트 결과 요약 출력"""
         print("\n" + "=" * 50)
@@ -5,9 +5,31 @@
 
 import sys
 import os
+import re
 import json
+import functools
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 함수/메서드 정의 이름 추출
+_DEF_RE = re.compile(r'^\s*def\s+(\w+)\s*\(', re.MULTILINE)
+
+@functools.lru_cache(maxsize=1)
+def _cwd_index():
+    """현재 디렉토리 파일 이름 집합 - 모든 테스트가 한 번의 스캔을 공유"""
+    with os.scandir('.') as entries:
+        return frozenset(entry.name for entry in entries)
+
+def _load_json(path):
+    """JSON 파일 로드 (orjson이 있으면 사용, 없으면 표준 json)"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson else json.loads(data)
+
 def test_file_structure():
     """파일 구조 테스트"""
     print("=== 파일 구조 테스트 ===")
@@ -21,9 +43,11 @@ def test_file_structure():
         'credential_manager.py'  # 인증정보
     ]
     
+    present = _cwd_index()
+    
     missing_files = []
     for file in files_to_check:
-        if os.path.exists(file):
+        if file in present:
             print(f"  ✅ {file}")
         else:
             print(f"  ❌ {file} - 없음")
@@ -35,10 +59,17 @@ def test_method_coverage():
     """메서드 포함 여부 테스트"""
     print("\n=== 핵심 메서드 포함 테스트 ===")
     
+    if 'lotto_auto_buyer_integrated_fixed.py' not in _cwd_index():
+        print("  ❌ lotto_auto_buyer_integrated_fixed.py - 없음")
+        return False
+    
     try:
         with open('lotto_auto_buyer_integrated_fixed.py', 'r', encoding='utf-8') as f:
             content = f.read()
         
+        # 정의된 함수 이름을 한 번에 추출해 집합으로 확인
+        defined = set(_DEF_RE.findall(content))
+        
         required_methods = [
             'buy_lotto_games',
             'get_purchase_numbers', 
@@ -56,7 +87,7 @@ def test_method_coverage():
         
         missing_methods = []
         for method in required_methods:
-            if f'def {method}(' in content:
+            if method in defined:
                 print(f"  ✅ {method}() - 포함됨")
             else:
                 print(f"  ❌ {method}() - 누락됨")
@@ -72,9 +103,15 @@ def test_config_compatibility():
     """설정 파일 호환성 테스트"""
     print("\n=== 설정 파일 호환성 테스트 ===")
     
+    if 'lotto_config.json' not in _cwd_index():
+        print("  ❌ lotto_config.json - 없음")
+        return False
+    
     try:
-        with open('lotto_config.json', 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        config = _load_json('lotto_config.json')
+        if not isinstance(config, dict):
+            print("  ❌ 설정 최상위가 객체가 아님")
+            return False
         
         required_sections = ['purchase', 'payment', 'options']
         missing_sections = []
@@ -87,19 +124,24 @@ def test_config_compatibility():
                 missing_sections.append(section)
         
         # purchase 섹션 상세 확인
-        if 'purchase' in config:
-            if 'lotto_list' in config['purchase']:
-                lotto_list = config['purchase']['lotto_list']
+        purchase = config.get('purchase')
+        if isinstance(purchase, dict):
+            lotto_list = purchase.get('lotto_list')
+            if isinstance(lotto_list, list):
                 print(f"  ✅ lotto_list 설정 - {len(lotto_list)}개 항목")
                 
                 for i, item in enumerate(lotto_list):
-                    if 'type' in item:
+                    if isinstance(item, dict) and 'type' in item:
                         print(f"    - [{i+1}] {item['type']}: {item.get('numbers', [])}")
                     else:
                         print(f"    - [{i+1}] 타입 누락")
+                        missing_sections.append(f'lotto_list[{i}].type')
             else:
-                print("  ❌ lotto_list 누락")
+                print("  ❌ lotto_list 누락 또는 목록이 아님")
                 missing_sections.append('lotto_list')
+        elif purchase is not None:
+            print("  ❌ purchase 섹션이 객체가 아님")
+            missing_sections.append('purchase')
         
         return len(missing_sections) == 0
         
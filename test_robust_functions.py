@@ -6,25 +6,127 @@
 import sys
 import os
 import json
+import re
+import gzip
 import time
 import logging
 from datetime import datetime
 from pathlib import Path
 
-# Selenium imports
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from dotenv_utils import parse_dotenv
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Selenium은 드라이버를 만들 때 로드 (인증정보 입력 단계에서 중단해도 import 비용 없음)
+webdriver = By = WebDriverWait = EC = Options = None
+TimeoutException = NoSuchElementException = None
+
+def _load_selenium():
+    """Selenium 지연 로드 - setup_driver에서 호출"""
+    global webdriver, By, WebDriverWait, EC, Options
+    global TimeoutException, NoSuchElementException
+    if webdriver is not None:
+        return
+    from selenium import webdriver as _webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.chrome.options import Options
+    from selenium.common.exceptions import TimeoutException, NoSuchElementException
+    webdriver = _webdriver
+
+# 선택자 종류 (selenium By 상수와 같은 값 - 모듈 로드 시 Selenium 불필요)
+_BY_ID, _BY_NAME, _BY_CSS, _BY_XPATH = "id", "name", "css selector", "xpath"
+
+# robust_login 선택자 (by, selector, 설명) - 우선순위 순서
+_ID_SELECTORS = (
+    (_BY_ID, "userId", "기존 ID 선택자"),
+    (_BY_NAME, "userId", "Name 속성"),
+    (_BY_NAME, "user_id", "Name 속성 (언더스코어)"),
+    (_BY_NAME, "username", "Username"),
+    (_BY_NAME, "loginId", "LoginId"),
+    (_BY_CSS, "input[placeholder*='아이디']", "플레이스홀더 아이디"),
+    (_BY_CSS, "input[placeholder*='ID']", "플레이스홀더 ID"),
+    (_BY_XPATH, "//input[contains(@placeholder, '아이디') or contains(@placeholder, 'ID')]", "XPath 플레이스홀더"),
+    (_BY_CSS, "input[type='text']:first-of-type", "첫 번째 텍스트 입력"),
+)
+
+_PW_SELECTORS = (
+    (_BY_ID, "password", "기존 비밀번호 선택자"),
+    (_BY_NAME, "password", "Name 속성"),
+    (_BY_NAME, "userPw", "UserPw"),
+    (_BY_NAME, "passwd", "Passwd"),
+    (_BY_NAME, "pwd", "Pwd"),
+    (_BY_CSS, "input[type='password']", "비밀번호 타입"),
+    (_BY_CSS, "input[placeholder*='비밀번호']", "플레이스홀더 비밀번호"),
+    (_BY_CSS, "input[placeholder*='패스워드']", "플레이스홀더 패스워드"),
+    (_BY_XPATH, "//input[@type='password']", "XPath 비밀번호 타입"),
+    (_BY_XPATH, "//input[contains(@placeholder, '비밀번호') or contains(@placeholder, '패스워드')]", "XPath 플레이스홀더"),
+)
+
+_LOGIN_BTN_SELECTORS = (
+    (_BY_CSS, "input[type='submit'][value='로그인']", "기존 로그인 버튼"),
+    (_BY_CSS, "input[value='로그인']", "Value 로그인"),
+    (_BY_CSS, "button[type='submit']", "Submit 버튼"),
+    (_BY_XPATH, "//input[@value='로그인']", "XPath Value 로그인"),
+    (_BY_XPATH, "//button[contains(text(), '로그인')]", "XPath 텍스트 로그인"),
+    (_BY_XPATH, "//input[@type='submit']", "XPath Submit"),
+    (_BY_XPATH, "//button[@type='submit']", "XPath Button Submit"),
+    (_BY_CSS, ".login-btn", "클래스 login-btn"),
+    (_BY_CSS, "#loginBtn", "ID loginBtn"),
+    (_BY_CSS, "form input[type='submit']", "폼 내 Submit"),
+)
+
+# find_element_robust 선택자 → CSS 변환 (XPath는 개별 확인)
+_BY_TO_CSS = {
+    _BY_ID: "#{}",
+    _BY_NAME: "[name='{}']",
+    _BY_CSS: "{}",
+}
+
+# 우선순위 순서대로 첫 번째로 존재하는 요소와 그 순번 반환
+_FIRST_MATCH_JS = """
+    const sels = arguments[0];
+    for (let i = 0; i < sels.length; i++) {
+        const el = document.querySelector(sels[i]);
+        if (el) return [el, i];
+    }
+    return null;
+"""
+
+# 로그인 성공 확인 - 페이지 문자열 / 현재 URL 검사
+_STRING_INDICATORS = frozenset({"마이페이지", "로그아웃", "내정보", "예치금", "구매내역", "당첨조회"})
+# UTF-8 바이트 패턴으로 한 번에 검사 (한글이 섞인 str은 문자당 2~4바이트로 저장되어 스캔이 느림)
+_STRING_INDICATOR_RE = re.compile(b"|".join(re.escape(s.encode('utf-8')) for s in sorted(_STRING_INDICATORS)))
+_URL_INDICATORS = (
+    lambda url: "login" not in url.lower(),
+)
+
+# 로그인 실패 메시지 후보 (오류 클래스 요소 → '오류/실패/확인' 텍스트 요소 순서, 빈 텍스트 제외)
+_ERROR_TEXTS_JS = """
+    const texts = Array.from(document.querySelectorAll('.error, .alert, .warning, .message'), e => e.innerText.trim());
+    const found = document.evaluate(
+        "//*[contains(text(), '오류') or contains(text(), '실패') or contains(text(), '확인')]",
+        document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+    );
+    for (let i = 0; i < found.snapshotLength; i++) {
+        texts.push(found.snapshotItem(i).innerText.trim());
+    }
+    return texts.filter(Boolean);
+"""
 
 class RobustLottoTester:
     """강화된 로또 기능 테스터"""
     
     def __init__(self):
         self.driver = None
+        self._waits = {}  # timeout → WebDriverWait (드라이버별 재사용)
         self.test_results = {}
+        # 기본은 헤드리스 (LOTTO_TEST_HEADLESS=0 이면 GUI 모드로 화면 확인)
+        self.headless = os.getenv('LOTTO_TEST_HEADLESS', '1') == '1'
         self.setup_logging()
         
     def setup_logging(self):
@@ -50,13 +152,7 @@ class RobustLottoTester:
         
         # 2. .env 파일에서 시도
         if os.path.exists('.env'):
-            env_vars = {}
-            with open('.env', 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        env_vars[key.strip()] = value.strip()
+            env_vars = parse_dotenv('.env')
             
             if env_vars.get('LOTTO_USER_ID') and env_vars.get('LOTTO_PASSWORD'):
                 return {
@@ -77,6 +173,7 @@ class RobustLottoTester:
     def setup_driver(self):
         """Chrome 드라이버 설정"""
         try:
+            _load_selenium()
             options = Options()
             options.add_argument('--disable-blink-features=AutomationControlled')
             options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
@@ -84,8 +181,20 @@ class RobustLottoTester:
             options.add_experimental_option('useAutomationExtension', False)
             options.add_argument('--window-size=1920,1080')
             
+            # 페이지 텍스트/요소만 확인하므로 헤드리스 + 이미지 로드 생략
+            if self.headless:
+                options.add_argument('--headless=new')
+                options.add_argument('--blink-settings=imagesEnabled=false')
+                options.add_argument('--disable-gpu')
+                options.add_argument('--no-sandbox')
+                options.add_argument('--disable-dev-shm-usage')
+            
             self.driver = webdriver.Chrome(options=options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            self._waits = {}
+            # 이 탭의 모든 문서 생성 시점에 주입 (페이지 스크립트보다 먼저 실행)
+            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+                'source': "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+            })
             
             self.logger.info("✅ Chrome 드라이버 초기화 완료")
             return True
@@ -94,21 +203,49 @@ class RobustLottoTester:
             self.logger.error(f"❌ 드라이버 초기화 실패: {e}")
             return False
     
+    def _wait(self, timeout=10):
+        """현재 드라이버용 WebDriverWait (timeout별로 한 번만 생성)"""
+        waiter = self._waits.get(timeout)
+        if waiter is None:
+            waiter = self._waits[timeout] = WebDriverWait(self.driver, timeout)
+        return waiter
+    
     def find_element_robust(self, selectors, description, timeout=10):
-        """여러 선택자를 시도해서 요소 찾기"""
-        self.logger.info(f"🔍 {description} 찾는 중...")
+        """여러 선택자를 시도해서 요소 찾기
+        
+        ID/Name/CSS 선택자는 CSS로 바꿔 한 번의 대기로 우선순위대로 확인하고,
+        XPath 선택자는 그래도 못 찾았을 때만 짧게 하나씩 시도한다.
+        """
+        self.logger.info("🔍 %s 찾는 중...", description)
+        
+        css_entries = [(_BY_TO_CSS[by_type].format(selector), desc)
+                       for by_type, selector, desc in selectors if by_type in _BY_TO_CSS]
+        if css_entries:
+            css_selectors = [css for css, _ in css_entries]
+            try:
+                element, index = self._wait(timeout).until(
+                    lambda d: d.execute_script(_FIRST_MATCH_JS, css_selectors)
+                )
+                self.logger.info("  ✅ 성공: %s", css_entries[index][1])
+                return element
+            except Exception as e:
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info("  ❌ 실패: CSS 선택자 %d개 - %s", len(css_entries), str(e)[:50])
         
         for i, (by_type, selector, desc) in enumerate(selectors):
+            if by_type in _BY_TO_CSS:
+                continue
             try:
-                self.logger.info(f"  시도 {i+1}: {desc}")
-                element = WebDriverWait(self.driver, timeout).until(
+                self.logger.info("  시도 %d: %s", i + 1, desc)
+                element = self._wait(2).until(
                     EC.presence_of_element_located((by_type, selector))
                 )
-                self.logger.info(f"  ✅ 성공: {desc}")
+                self.logger.info("  ✅ 성공: %s", desc)
                 return element
                 
             except Exception as e:
-                self.logger.info(f"  ❌ 실패: {desc} - {str(e)[:50]}")
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info("  ❌ 실패: %s - %s", desc, str(e)[:50])
                 continue
         
         raise Exception(f"{description}를 모든 방법으로 찾을 수 없습니다.")
@@ -122,128 +259,64 @@ class RobustLottoTester:
             user_id = credentials['user_id']
             password = credentials['password']
             
-            # 로그인 페이지 접속
-            self.driver.get("https://www.dhlottery.co.kr/user.do?method=login")
-            time.sleep(3)
+            # 로그인 페이지 접속 (비밀번호 입력칸이 나타날 때까지 대기)
+            login_url = "https://www.dhlottery.co.kr/user.do?method=login"
+            self.driver.get(login_url)
+            try:
+                self._wait(10).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='password']"))
+                )
+            except TimeoutException:
+                self.logger.warning("  ⚠️ 비밀번호 입력칸 대기 시간 초과 - 선택자 탐색 계속")
             
             # ID 입력 필드 찾기 (여러 방법 시도)
-            id_selectors = [
-                (By.ID, "userId", "기존 ID 선택자"),
-                (By.NAME, "userId", "Name 속성"),
-                (By.NAME, "user_id", "Name 속성 (언더스코어)"),
-                (By.NAME, "username", "Username"),
-                (By.NAME, "loginId", "LoginId"),
-                (By.CSS_SELECTOR, "input[placeholder*='아이디']", "플레이스홀더 아이디"),
-                (By.CSS_SELECTOR, "input[placeholder*='ID']", "플레이스홀더 ID"),
-                (By.XPATH, "//input[contains(@placeholder, '아이디') or contains(@placeholder, 'ID')]", "XPath 플레이스홀더"),
-                (By.CSS_SELECTOR, "input[type='text']:first-of-type", "첫 번째 텍스트 입력"),
-            ]
-            
-            id_input = self.find_element_robust(id_selectors, "ID 입력 필드")
+            id_input = self.find_element_robust(_ID_SELECTORS, "ID 입력 필드")
             id_input.clear()
             id_input.send_keys(user_id)
             self.logger.info("  ✅ ID 입력 완료")
             
             # 비밀번호 입력 필드 찾기 (여러 방법 시도)
-            password_selectors = [
-                (By.ID, "password", "기존 비밀번호 선택자"),
-                (By.NAME, "password", "Name 속성"),
-                (By.NAME, "userPw", "UserPw"),
-                (By.NAME, "passwd", "Passwd"),
-                (By.NAME, "pwd", "Pwd"),
-                (By.CSS_SELECTOR, "input[type='password']", "비밀번호 타입"),
-                (By.CSS_SELECTOR, "input[placeholder*='비밀번호']", "플레이스홀더 비밀번호"),
-                (By.CSS_SELECTOR, "input[placeholder*='패스워드']", "플레이스홀더 패스워드"),
-                (By.XPATH, "//input[@type='password']", "XPath 비밀번호 타입"),
-                (By.XPATH, "//input[contains(@placeholder, '비밀번호') or contains(@placeholder, '패스워드')]", "XPath 플레이스홀더"),
-            ]
-            
-            pw_input = self.find_element_robust(password_selectors, "비밀번호 입력 필드")
+            pw_input = self.find_element_robust(_PW_SELECTORS, "비밀번호 입력 필드")
             pw_input.clear()
             pw_input.send_keys(password)
             self.logger.info("  ✅ 비밀번호 입력 완료")
             
             # 로그인 버튼 찾기 (여러 방법 시도)
-            login_button_selectors = [
-                (By.CSS_SELECTOR, "input[type='submit'][value='로그인']", "기존 로그인 버튼"),
-                (By.CSS_SELECTOR, "input[value='로그인']", "Value 로그인"),
-                (By.CSS_SELECTOR, "button[type='submit']", "Submit 버튼"),
-                (By.XPATH, "//input[@value='로그인']", "XPath Value 로그인"),
-                (By.XPATH, "//button[contains(text(), '로그인')]", "XPath 텍스트 로그인"),
-                (By.XPATH, "//input[@type='submit']", "XPath Submit"),
-                (By.XPATH, "//button[@type='submit']", "XPath Button Submit"),
-                (By.CSS_SELECTOR, ".login-btn", "클래스 login-btn"),
-                (By.CSS_SELECTOR, "#loginBtn", "ID loginBtn"),
-                (By.CSS_SELECTOR, "form input[type='submit']", "폼 내 Submit"),
-            ]
-            
-            login_btn = self.find_element_robust(login_button_selectors, "로그인 버튼")
+            login_btn = self.find_element_robust(_LOGIN_BTN_SELECTORS, "로그인 버튼")
+            before_url = self.driver.current_url  # 리다이렉트 등으로 요청 URL과 다를 수 있음
             login_btn.click()
             self.logger.info("  ✅ 로그인 버튼 클릭 완료")
             
-            # 로그인 결과 확인 (더 넓은 범위로)
-            time.sleep(5)  # 로딩 시간 증가
-            
-            # 성공 확인 방법들
-            success_indicators = [
-                "마이페이지",
-                "로그아웃", 
-                "내정보",
-                "예치금",
-                "구매내역",
-                "당첨조회",
-                lambda: "login" not in self.driver.current_url.lower(),
-                lambda: self.driver.current_url != "https://www.dhlottery.co.kr/user.do?method=login"
-            ]
+            # 로그인 결과 확인 (더 넓은 범위로) - 실제로 열려 있던 로그인 페이지를 벗어날 때까지 대기
+            try:
+                self._wait(10).until(EC.url_changes(before_url))
+            except TimeoutException:
+                pass
             
-            login_success = False
             current_url = self.driver.current_url
-            page_source = self.driver.page_source
+            page_source = self.driver.page_source.encode('utf-8')
             
-            for indicator in success_indicators:
-                if callable(indicator):
-                    try:
-                        if indicator():
-                            login_success = True
-                            break
-                    except:
-                        continue
-                else:
-                    if indicator in page_source:
-                        login_success = True
-                        break
+            # 성공 확인 - 페이지 문자열 먼저, 없으면 URL 상태
+            login_success = _STRING_INDICATOR_RE.search(page_source) is not None
+            if not login_success:
+                # 이미 읽어둔 current_url로 검사 (드라이버 재조회 없음)
+                login_success = any(indicator(current_url) for indicator in _URL_INDICATORS)
             
             if login_success:
                 self.logger.info("  ✅ 로그인 성공 확인")
                 self.test_results[test_name] = {"status": "성공", "message": f"정상 로그인 (URL: {current_url})"}
                 return True
             else:
-                # 실패 원인 분석
-                error_selectors = [
-                    (By.CSS_SELECTOR, ".error"),
-                    (By.CSS_SELECTOR, ".alert"),
-                    (By.CSS_SELECTOR, ".warning"),
-                    (By.CSS_SELECTOR, ".message"),
-                    (By.XPATH, "//*[contains(text(), '오류') or contains(text(), '실패') or contains(text(), '확인')]"),
-                ]
-                
-                error_msg = "로그인 상태 확인 실패"
-                for by_type, selector in error_selectors:
-                    try:
-                        error_elements = self.driver.find_elements(by_type, selector)
-                        for element in error_elements:
-                            text = element.text.strip()
-                            if text and len(text) > 0:
-                                error_msg = text
-                                break
-                        if error_msg != "로그인 상태 확인 실패":
-                            break
-                    except:
-                        continue
+                # 실패 원인 분석 - 오류 메시지 후보를 한 번의 스크립트 호출로 수집
+                try:
+                    error_texts = self.driver.execute_script(_ERROR_TEXTS_JS) or []
+                except:
+                    error_texts = []
+                error_msg = error_texts[0] if error_texts else "로그인 상태 확인 실패"
                 
-                # 페이지 소스 저장 (디버깅용)
+                # 페이지 소스 저장 (디버깅용, 빠른 압축으로 용량 절감)
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                with open(f'login_fail_debug_{timestamp}.html', 'w', encoding='utf-8') as f:
+                with gzip.open(f'login_fail_debug_{timestamp}.html.gz', 'wb', compresslevel=1) as f:
                     f.write(page_source)
                 
                 raise Exception(f"로그인 실패: {error_msg}")
@@ -268,13 +341,29 @@ class RobustLottoTester:
             
             accessible_pages = []
             
+            # 페이지마다 새 탭을 열어 브라우저가 동시에 로드하도록 함
+            main_handle = self.driver.current_window_handle
+            tab_handles = []
             for page_name, url in pages_to_test:
+                before = set(self.driver.window_handles)
+                self.driver.execute_script("window.open(arguments[0], '_blank');", url)
+                new_handles = set(self.driver.window_handles) - before
+                tab_handles.append((page_name, new_handles.pop() if new_handles else None))
+            
+            for page_name, handle in tab_handles:
+                if handle is None:
+                    self.logger.warning(f"  ❌ {page_name} 탭 열기 실패")
+                    continue
+                
                 try:
-                    self.driver.get(url)
-                    time.sleep(3)
+                    self.driver.switch_to.window(handle)
+                    self._wait(10).until(
+                        lambda d: d.execute_script('return document.readyState') == 'complete'
+                    )
                     
                     # 페이지 로딩 확인
-                    if "오류" not in self.driver.page_source and "error" not in self.driver.page_source.lower():
+                    page_source = self.driver.page_source
+                    if "오류" not in page_source and "error" not in page_source.lower():
                         accessible_pages.append(page_name)
                         self.logger.info(f"  ✅ {page_name} 접근 성공")
                     else:
@@ -282,6 +371,13 @@ class RobustLottoTester:
                         
                 except Exception as e:
                     self.logger.warning(f"  ❌ {page_name} 접근 오류: {e}")
+                finally:
+                    try:
+                        self.driver.close()
+                    except:
+                        pass
+            
+            self.driver.switch_to.window(main_handle)
             
             if accessible_pages:
                 self.test_results[test_name] = {
@@ -337,6 +433,7 @@ class RobustLottoTester:
             
             # 결과 출력
             self.print_test_summary(passed_tests, total_tests)
+            self._save_results()
             
             return passed_tests > 0  # 하나라도 성공하면 OK
             
@@ -345,9 +442,22 @@ class RobustLottoTester:
             return False
         finally:
             if self.driver:
-                input("\n🔍 브라우저를 확인하려면 Enter를 누르세요...")
+                if not self.headless:
+                    input("\n🔍 브라우저를 확인하려면 Enter를 누르세요...")
                 self.driver.quit()
     
+    def _save_results(self, path='robust_test_results.json'):
+        """테스트 결과를 JSON 파일로 저장 (orjson이 있으면 사용)"""
+        try:
+            if orjson:
+                data = orjson.dumps(self.test_results, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(self.test_results, ensure_ascii=False, indent=2).encode('utf-8')
+            Path(path).write_bytes(data)
+            self.logger.info(f"💾 테스트 결과 저장: {path}")
+        except Exception as e:
+            self.logger.warning(f"⚠️ 테스트 결과 저장 실패: {e}")
+    
     def print_test_summary(self, passed, total):
         """테스트 결과 요약 출력"""
         print("\n" + "=" * 60)
@@ -5,10 +5,10 @@ TAB + ENTER 방식 로그인을 사용한 강화된 테스트
 
 import sys
 import os
+import re
 import json
 import time
 import logging
-from datetime import datetime
 from pathlib import Path
 
 # Selenium imports
@@ -18,11 +18,85 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+
+from dotenv_utils import parse_dotenv
+
+# 디버그 파일 이름용 타임스탬프 형식
+_TS_FMT = "%Y%m%d_%H%M%S"
+
+def _ts():
+    """현재 시각 타임스탬프 (예: 20240101_093000)"""
+    return time.strftime(_TS_FMT)
+
+# ID/Name/CSS 선택자를 CSS 선택자로 변환하는 형식
+_BY_TO_CSS = {
+    By.ID: "#{}",
+    By.NAME: "[name='{}']",
+    By.CSS_SELECTOR: "{}",
+}
+
+# 예치금 후보 요소의 텍스트를 우선순위 순서대로 수집
+# (예치금 옆 칸 → 금액 강조 → 우측 정렬 칸 → 금액 클래스)
+_BALANCE_TEXTS_JS = """
+    const out = [];
+    const push = el => { const t = (el.innerText || '').trim(); if (t) out.push(t); };
+    for (const td of document.querySelectorAll('td')) {
+        const next = td.nextElementSibling;
+        if (td.textContent.includes('예치금') && next && next.textContent.includes('원')) push(next);
+    }
+    for (const el of document.querySelectorAll('strong')) {
+        const t = el.textContent;
+        if (t.includes('원') && t.includes(',')) push(el);
+    }
+    document.querySelectorAll('td.ta_right, .amount, .balance, .money').forEach(push);
+    return out;
+"""
+
+# 이름별 후보 ID 중 화면에 보이는 첫 번째 ID 반환 ({이름: ID})
+_VISIBLE_IDS_JS = """
+    const candidates = arguments[0];
+    const out = {};
+    for (const name in candidates) {
+        for (const id of candidates[name]) {
+            const el = document.getElementById(id);
+            if (el && el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden') {
+                out[name] = id;
+                break;
+            }
+        }
+    }
+    return out;
+"""
+
+# 우선순위 순서대로 첫 번째로 존재하는 요소와 그 순번 반환
+_FIRST_MATCH_JS = """
+    const sels = arguments[0];
+    for (let i = 0; i < sels.length; i++) {
+        const el = document.querySelector(sels[i]);
+        if (el) return [el, i];
+    }
+    return null;
+"""
 
 class TabEnterLottoTester:
     """TAB + ENTER 방식 로또 테스터"""
     
+    # 로그인 성공 지표 - 한 번의 정규식 검색으로 확인
+    SUCCESS_INDICATORS = ("마이페이지", "로그아웃", "내정보", "예치금", "구매내역", "당첨조회", "welcome")
+    _SUCCESS_RE = re.compile('|'.join(map(re.escape, SUCCESS_INDICATORS)))
+    
+    # 로그인 실패 시 오류 메시지 키워드 - 한 번의 XPath로 후보 요소 조회 (영문은 대소문자 무시)
+    ERROR_KEYWORDS = ("오류", "실패", "확인", "error", "fail", "invalid")
+    _ERROR_RE = re.compile('|'.join(map(re.escape, ERROR_KEYWORDS)), re.IGNORECASE)
+    _ERROR_XPATH = "//*[" + " or ".join(
+        f"contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{keyword}')"
+        for keyword in ERROR_KEYWORDS
+    ) + "]"
+    
+    # 예치금 금액 후보 (콤마 포함 3자 이상)
+    _BALANCE_NUM_RE = re.compile(r'[\d,]{3,}')
+    
     def __init__(self):
         self.driver = None
         self.test_results = {}
@@ -51,13 +125,7 @@ class TabEnterLottoTester:
         
         # 2. .env 파일에서 시도
         if os.path.exists('.env'):
-            env_vars = {}
-            with open('.env', 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        env_vars[key.strip()] = value.strip()
+            env_vars = parse_dotenv('.env')
             
             if env_vars.get('LOTTO_USER_ID') and env_vars.get('LOTTO_PASSWORD'):
                 return {
@@ -85,7 +153,8 @@ class TabEnterLottoTester:
             options.add_experimental_option('useAutomationExtension', False)
             options.add_argument('--window-size=1920,1080')
             
-            self.driver = webdriver.Chrome(options=options)
+            # keep_alive=True는 selenium 4의 기본값 - 연결 재사용을 명시적으로 드러내기 위해 표기
+            self.driver = webdriver.Chrome(options=options, keep_alive=True)
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
             self.logger.info("✅ Chrome 드라이버 초기화 완료")
@@ -95,14 +164,40 @@ class TabEnterLottoTester:
             self.logger.error(f"❌ 드라이버 초기화 실패: {e}")
             return False
     
+    def _wait(self, timeout=10):
+        """짧은 간격(0.1초)으로 확인하는 WebDriverWait"""
+        return WebDriverWait(
+            self.driver, timeout, poll_frequency=0.1,
+            ignored_exceptions=(NoSuchElementException, StaleElementReferenceException)
+        )
+    
     def find_element_robust(self, selectors, description, timeout=10):
-        """여러 선택자를 시도해서 요소 찾기"""
+        """여러 선택자를 시도해서 요소 찾기
+        
+        ID/Name/CSS 선택자는 CSS로 바꿔 한 번의 대기로 우선순위대로 확인하고,
+        XPath 선택자만 하나씩 시도한다.
+        """
         self.logger.info(f"🔍 {description} 찾는 중...")
         
+        css_entries = [(_BY_TO_CSS[by_type].format(selector), desc)
+                       for by_type, selector, desc in selectors if by_type in _BY_TO_CSS]
+        if css_entries:
+            css_selectors = [css for css, _ in css_entries]
+            try:
+                element, index = self._wait(timeout).until(
+                    lambda d: d.execute_script(_FIRST_MATCH_JS, css_selectors)
+                )
+                self.logger.info(f"  ✅ 성공: {css_entries[index][1]}")
+                return element
+            except Exception:
+                self.logger.info(f"  ❌ 실패: CSS 선택자 {len(css_entries)}개")
+        
         for i, (by_type, selector, desc) in enumerate(selectors):
+            if by_type in _BY_TO_CSS:
+                continue
             try:
                 self.logger.info(f"  시도 {i+1}: {desc}")
-                element = WebDriverWait(self.driver, timeout).until(
+                element = self._wait(timeout).until(
                     EC.presence_of_element_located((by_type, selector))
                 )
                 self.logger.info(f"  ✅ 성공: {desc}")
@@ -123,9 +218,15 @@ class TabEnterLottoTester:
             user_id = credentials['user_id']
             password = credentials['password']
             
-            # 로그인 페이지 접속
-            self.driver.get("https://www.dhlottery.co.kr/user.do?method=login")
-            time.sleep(3)
+            # 로그인 페이지 접속 (ID 입력 필드가 나타날 때까지 대기)
+            login_url = "https://www.dhlottery.co.kr/user.do?method=login"
+            self.driver.get(login_url)
+            try:
+                self._wait(10).until(
+                    EC.presence_of_element_located((By.ID, "userId"))
+                )
+            except TimeoutException:
+                self.logger.info("  ⚠️ userId 필드 대기 시간 초과 - 대체 선택자로 진행")
             
             # ID 입력 필드 찾기
             id_selectors = [
@@ -156,6 +257,7 @@ class TabEnterLottoTester:
             
             # TAB + ENTER 방식으로 로그인
             self.logger.info("  🔄 TAB 키 입력...")
+            before_url = self.driver.current_url  # 리다이렉트 등으로 요청 URL과 다를 수 있음
             pw_input.send_keys(Keys.TAB)
             time.sleep(1)  # 포커스 이동 대기
             
@@ -170,36 +272,33 @@ class TabEnterLottoTester:
             except:
                 pass
             
-            # 로그인 처리 대기
-            time.sleep(5)
+            # 로그인 처리 대기 (제출 전 URL에서 바뀌거나 로그인 후에만 보이는 로그아웃 링크가 나타나면 진행)
+            # 마이페이지/당첨조회 등은 로그인 페이지 상단에도 있을 수 있어 대기 조건으로 쓰지 않음
+            try:
+                self._wait(10).until(
+                    lambda d: d.current_url != before_url
+                    or d.find_elements(By.PARTIAL_LINK_TEXT, "로그아웃")
+                )
+            except TimeoutException:
+                self.logger.info("  ⚠️ 로그인 처리 대기 시간 초과")
             
             # 로그인 성공 확인
             current_url = self.driver.current_url
             page_source = self.driver.page_source
             
-            success_indicators = [
-                "마이페이지",
-                "로그아웃", 
-                "내정보",
-                "예치금",
-                "구매내역",
-                "당첨조회",
-                "welcome"
-            ]
-            
             login_success = False
             
             # URL 변경 확인
-            if "login" not in current_url.lower() or current_url != "https://www.dhlottery.co.kr/user.do?method=login":
+            if "login" not in current_url.casefold() or current_url != login_url:
                 login_success = True
                 self.logger.info(f"  ✅ URL 변경 확인: {current_url}")
             
-            # 페이지 내용 확인
-            for indicator in success_indicators:
-                if indicator in page_source:
+            # 페이지 내용 확인 (URL로 이미 확인되면 생략)
+            if not login_success:
+                match = self._SUCCESS_RE.search(page_source)
+                if match:
                     login_success = True
-                    self.logger.info(f"  ✅ 성공 지표 발견: {indicator}")
-                    break
+                    self.logger.info(f"  ✅ 성공 지표 발견: {match.group()}")
             
             if login_success:
                 self.logger.info("  🎉 TAB + ENTER 로그인 성공!")
@@ -213,25 +312,21 @@ class TabEnterLottoTester:
                 error_msg = "로그인 상태 확인 실패"
                 
                 # 오류 메시지 찾기
-                error_keywords = ["오류", "실패", "확인", "error", "fail", "invalid"]
-                for keyword in error_keywords:
-                    if keyword in page_source.lower():
-                        # 오류 메시지 추출 시도
-                        try:
-                            error_elements = self.driver.find_elements(By.XPATH, f"//*[contains(text(), '{keyword}')]")
-                            for element in error_elements[:3]:  # 처음 3개만 확인
-                                text = element.text.strip()
-                                if text and len(text) < 100:  # 너무 긴 텍스트 제외
-                                    error_msg = text
-                                    break
-                        except:
-                            pass
-                        break
+                if self._ERROR_RE.search(page_source):
+                    # 오류 메시지 추출 시도
+                    try:
+                        error_elements = self.driver.find_elements(By.XPATH, self._ERROR_XPATH)
+                        for element in error_elements[:3]:  # 처음 3개만 확인
+                            text = element.text.strip()
+                            if text and len(text) < 100:  # 너무 긴 텍스트 제외
+                                error_msg = text
+                                break
+                    except:
+                        pass
                 
                 # 디버그 정보 저장
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                with open(f'tab_enter_debug_{timestamp}.html', 'w', encoding='utf-8') as f:
-                    f.write(page_source)
+                timestamp = _ts()
+                Path(f'tab_enter_debug_{timestamp}.html').write_bytes(page_source.encode('utf-8'))
                 
                 self.logger.error(f"  ❌ TAB + ENTER 로그인 실패: {error_msg}")
                 self.test_results[test_name] = {"status": "실패", "message": error_msg}
@@ -250,61 +345,38 @@ class TabEnterLottoTester:
         try:
             # 마이페이지로 이동
             self.driver.get("https://www.dhlottery.co.kr/myPage.do?method=myPage")
-            time.sleep(3)
-            
-            # 다양한 방법으로 예치금 찾기
-            balance_selectors = [
-                (By.XPATH, "//td[contains(text(), '예치금')]/following-sibling::td[contains(text(), '원')]"),
-                (By.XPATH, "//strong[contains(text(), '원') and contains(text(), ',')]"),
-                (By.XPATH, "//td[@class='ta_right' and contains(text(), '원')]"),
-                (By.CSS_SELECTOR, "td.ta_right"),
-                (By.XPATH, "//*[contains(text(), '원') and string-length(text()) > 3 and string-length(text()) < 20]"),
-                (By.CSS_SELECTOR, ".amount"),
-                (By.CSS_SELECTOR, ".balance"),
-                (By.CSS_SELECTOR, ".money"),
-            ]
+            try:
+                self._wait(10).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "td.ta_right, .amount, .balance"))
+                )
+            except TimeoutException:
+                self.logger.info("  ⚠️ 예치금 영역 대기 시간 초과")
+            
+            # 예치금 후보 텍스트를 한 번의 스크립트 호출로 수집 (요소별 .text 왕복 제거)
+            texts = self.driver.execute_script(_BALANCE_TEXTS_JS) or []
+            self.logger.info(f"  🔍 후보 요소 {len(texts)}개 발견")
             
             balance_found = False
             balance_amount = 0
             
-            for i, (selector_type, selector) in enumerate(balance_selectors):
-                try:
-                    elements = self.driver.find_elements(selector_type, selector)
-                    self.logger.info(f"  🔍 선택자 {i+1}: {len(elements)}개 요소 발견")
-                    
-                    for j, element in enumerate(elements):
-                        try:
-                            text = element.text.strip()
-                            if not text:
-                                continue
-                                
-                            self.logger.info(f"    - 요소 {j+1}: '{text}'")
-                            
-                            # 숫자 추출 및 검증
-                            import re
-                            numbers = re.findall(r'[\d,]+', text)
-                            
-                            for number_str in numbers:
-                                clean_number = number_str.replace(',', '')
-                                if clean_number.isdigit() and len(clean_number) >= 3:
-                                    balance = int(clean_number)
-                                    if 0 <= balance <= 50000000:  # 5천만원 이하
-                                        balance_amount = balance
-                                        balance_found = True
-                                        self.logger.info(f"  ✅ 예치금 발견: {balance:,}원")
-                                        break
-                            
-                            if balance_found:
-                                break
-                                
-                        except Exception as inner_e:
-                            continue
-                    
-                    if balance_found:
-                        break
-                        
-                except Exception as e:
-                    continue
+            for j, text in enumerate(texts):
+                self.logger.info(f"    - 요소 {j+1}: '{text}'")
+                
+                # 숫자 추출 및 검증
+                numbers = self._BALANCE_NUM_RE.findall(text)
+                
+                for number_str in numbers:
+                    clean_number = number_str.replace(',', '')
+                    if clean_number.isdigit() and len(clean_number) >= 3:
+                        balance = int(clean_number)
+                        if 0 <= balance <= 50000000:  # 5천만원 이하
+                            balance_amount = balance
+                            balance_found = True
+                            self.logger.info(f"  ✅ 예치금 발견: {balance:,}원")
+                            break
+                
+                if balance_found:
+                    break
             
             if balance_found:
                 self.test_results[test_name] = {
@@ -315,9 +387,8 @@ class TabEnterLottoTester:
                 return True
             else:
                 # 디버깅 정보 저장
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                with open(f'balance_debug_{timestamp}.html', 'w', encoding='utf-8') as f:
-                    f.write(self.driver.page_source)
+                timestamp = _ts()
+                Path(f'balance_debug_{timestamp}.html').write_bytes(self.driver.page_source.encode('utf-8'))
                 
                 self.logger.warning(f"  ⚠️ 예치금을 찾을 수 없습니다. 디버그 파일: balance_debug_{timestamp}.html")
                 self.test_results[test_name] = {
@@ -339,7 +410,12 @@ class TabEnterLottoTester:
         try:
             # 로또 구매 페이지로 이동
             self.driver.get("https://ol.dhlottery.co.kr/olotto/game/game645.do")
-            time.sleep(3)
+            try:
+                self._wait(10).until(
+                    EC.presence_of_element_located((By.ID, "amoundApply"))
+                )
+            except TimeoutException:
+                self.logger.info("  ⚠️ 수량선택 요소 대기 시간 초과")
             
             # 핵심 요소 확인
             key_elements = {
@@ -348,22 +424,17 @@ class TabEnterLottoTester:
                 "구매버튼": ["btnBuy", "buy", "purchase"]
             }
             
+            # 모든 후보 ID를 한 번의 스크립트 호출로 확인
+            visible_ids = self.driver.execute_script(_VISIBLE_IDS_JS, key_elements) or {}
+            
             found_elements = []
             
-            for element_name, possible_ids in key_elements.items():
-                element_found = False
-                for possible_id in possible_ids:
-                    try:
-                        element = self.driver.find_element(By.ID, possible_id)
-                        if element.is_displayed():
-                            found_elements.append(f"{element_name}({possible_id})")
-                            element_found = True
-                            self.logger.info(f"  ✅ {element_name} 발견: {possible_id}")
-                            break
-                    except:
-                        continue
-                
-                if not element_found:
+            for element_name in key_elements:
+                possible_id = visible_ids.get(element_name)
+                if possible_id:
+                    found_elements.append(f"{element_name}({possible_id})")
+                    self.logger.info(f"  ✅ {element_name} 발견: {possible_id}")
+                else:
                     self.logger.warning(f"  ❌ {element_name} 찾을 수 없음")
             
             if found_elements:
@@ -402,21 +473,31 @@ class TabEnterLottoTester:
             return False
         
         try:
-            # 테스트 실행
+            # 테스트 실행 (이름, 함수, 로그인 필요 여부)
             tests = [
-                ("TAB + ENTER 로그인", lambda: self.tab_enter_login(credentials)),
-                ("잔액 확인", self.test_balance_check_enhanced),
-                ("구매 페이지", self.test_purchase_page_quick),
+                ("TAB + ENTER 로그인", lambda: self.tab_enter_login(credentials), False),
+                ("잔액 확인", self.test_balance_check_enhanced, True),
+                ("구매 페이지", self.test_purchase_page_quick, True),
             ]
             
             passed_tests = 0
             total_tests = len(tests)
+            login_passed = False
             
-            for test_name, test_func in tests:
+            for test_name, test_func, needs_login in tests:
                 print(f"\n📋 {test_name} 테스트...")
+                
+                # 로그인 실패 시 로그인이 필요한 테스트는 대기 없이 건너뜀
+                if needs_login and not login_passed:
+                    self.logger.warning(f"  ⏭️ {test_name}: 로그인 실패로 건너뜀")
+                    self.test_results[test_name] = {"status": "건너뜀", "message": "로그인 실패로 건너뜀"}
+                    continue
+                
                 result = test_func()
                 if result:
                     passed_tests += 1
+                    if not needs_login:
+                        login_passed = True
                 time.sleep(2)
             
             # 결과 출력
@@ -429,7 +510,9 @@ class TabEnterLottoTester:
             return False
         finally:
             if self.driver:
-                input("\n🔍 브라우저를 확인하려면 Enter를 누르세요...")
+                # 자동 실행(CI 등)에서는 입력 대기 없이 종료
+                if sys.stdin.isatty():
+                    input("\n🔍 브라우저를 확인하려면 Enter를 누르세요...")
                 self.driver.quit()
     
     def print_test_summary(self, passed, total):
@@ -444,7 +527,7 @@ class TabEnterLottoTester:
             
             if status == "성공":
                 print(f"✅ {test_name}: {message}")
-            elif status == "부분성공" or status == "경고":
+            elif status == "부분성공" or status == "경고" or status == "건너뜀":
                 print(f"⚠️  {test_name}: {message}")
             else:
                 print(f"❌ {test_name}: {message}")
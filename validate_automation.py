@@ -4,13 +4,45 @@
 사용자 입력 없이 모든 설정이 올바른지 확인
 """
 
+import ast
+import asyncio
+import importlib.util
 import os
+import re
 import sys
 import json
 import subprocess
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from dotenv_utils import parse_dotenv
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# JSON 파싱 (orjson이 있으면 사용, 없으면 표준 json - 둘 다 bytes 입력 가능)
+_loads = orjson.loads if orjson else json.loads
+
+
+# 사용자 입력이 필요한 호출 - 소스 전체를 한 번만 훑는 사전 검사용 정규식
+_PROBLEMATIC_CALLS = ('input', 'getpass.getpass', 'raw_input', 'sys.stdin.read')
+_PROBLEMATIC_RE = re.compile(r'\binput\s*\(|getpass\.getpass|raw_input|sys\.stdin\.read')
+
+def _call_name(node):
+    """호출 대상 이름을 점 표기로 반환 (예: sys.stdin.read), 알 수 없으면 None"""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return '.'.join(reversed(parts))
+
 class AutomationValidator:
     """자동화 시스템 검증 클래스"""
     
@@ -18,25 +50,61 @@ class AutomationValidator:
         self.errors = []
         self.warnings = []
         self.successes = []
+        self._present = None
+        self._local = threading.local()
+    
+    def _present_files(self):
+        """현재 디렉토리 파일 이름 집합 (목록은 한 번만 읽어 재사용)"""
+        if self._present is None:
+            with os.scandir('.') as entries:
+                self._present = {entry.name for entry in entries}
+        return self._present
+    
+    def _file_exists(self, name):
+        """현재 디렉토리 파일 존재 여부"""
+        return name in self._present_files()
+        
+    def _emit(self, level, message):
+        """로그 기록 - 검사를 동시에 실행 중이면 해당 검사의 버퍼에 모아 둠"""
+        records = getattr(self._local, 'records', None)
+        if records is not None:
+            records.append((level, message))
+        else:
+            self._apply(level, message)
+    
+    def _apply(self, level, message):
+        """로그 출력 및 결과 목록에 반영"""
+        if level == 'section':
+            print(message)
+        elif level == 'success':
+            print(f"✅ {message}")
+            self.successes.append(message)
+        elif level == 'warning':
+            print(f"⚠️  {message}")
+            self.warnings.append(message)
+        else:
+            print(f"❌ {message}")
+            self.errors.append(message)
+    
+    def log_section(self, message):
+        """검사 구간 제목"""
+        self._emit('section', message)
         
     def log_success(self, message):
         """성공 로그"""
-        print(f"✅ {message}")
-        self.successes.append(message)
+        self._emit('success', message)
         
     def log_warning(self, message):
         """경고 로그"""
-        print(f"⚠️  {message}")
-        self.warnings.append(message)
+        self._emit('warning', message)
         
     def log_error(self, message):
         """에러 로그"""
-        print(f"❌ {message}")
-        self.errors.append(message)
+        self._emit('error', message)
         
     def check_files(self):
         """필수 파일 존재 확인"""
-        print("\n🔍 필수 파일 확인 중...")
+        self.log_section("\n🔍 필수 파일 확인 중...")
         
         required_files = [
             'lotto_automated.py',          # 메인 자동화 스크립트
@@ -51,64 +119,63 @@ class AutomationValidator:
             'lotto_config.json'            # 기본 설정
         ]
         
+        missing = set(required_files) - self._present_files()
         for file in required_files:
-            if os.path.exists(file):
+            if file not in missing:
                 self.log_success(f"{file} 존재")
-            else:
+        for file in required_files:
+            if file in missing:
                 self.log_error(f"{file} 누락")
     
     def check_docker_environment(self):
         """도커 환경 확인"""
-        print("\n🐳 도커 환경 확인 중...")
+        self.log_section("\n🐳 도커 환경 확인 중...")
         
-        try:
-            # Docker 설치 확인
-            result = subprocess.run(['docker', '--version'], 
-                                  capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                self.log_success(f"Docker 설치됨: {result.stdout.strip()}")
-            else:
-                self.log_error("Docker가 설치되지 않음")
-                
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            self.log_error("Docker 명령어 실행 실패")
+        # (명령어, 이름) - 서로 독립적인 프로세스이므로 동시에 실행
+        probes = [
+            (['docker', '--version'], 'Docker'),
+            (['docker-compose', '--version'], 'Docker Compose'),
+        ]
         
-        try:
-            # Docker Compose 확인
-            result = subprocess.run(['docker-compose', '--version'], 
-                                  capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                self.log_success(f"Docker Compose 설치됨: {result.stdout.strip()}")
+        def probe(command):
+            try:
+                return subprocess.run(command, capture_output=True, text=True, timeout=10)
+            except (subprocess.TimeoutExpired, FileNotFoundError):
+                return None
+        
+        with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+            results = list(executor.map(probe, [command for command, _ in probes]))
+        
+        # 로그는 메인 스레드에서 원래 순서대로 출력
+        for (_, name), result in zip(probes, results):
+            if result is None:
+                self.log_error(f"{name} 명령어 실행 실패")
+            elif result.returncode == 0:
+                self.log_success(f"{name} 설치됨: {result.stdout.strip()}")
             else:
-                self.log_error("Docker Compose가 설치되지 않음")
-                
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            self.log_error("Docker Compose 명령어 실행 실패")
+                self.log_error(f"{name}가 설치되지 않음")
     
     def check_environment_variables(self):
         """환경변수 설정 확인"""
-        print("\n🔧 환경변수 설정 확인 중...")
+        self.log_section("\n🔧 환경변수 설정 확인 중...")
         
         # .env 파일 확인
-        if os.path.exists('.env'):
+        if self._file_exists('.env'):
             self.log_success(".env 파일 존재")
             
             # 환경변수 파싱
-            env_vars = {}
             try:
-                with open('.env', 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#') and '=' in line:
-                            key, value = line.split('=', 1)
-                            env_vars[key.strip()] = value.strip()
+                env_vars = parse_dotenv('.env')
                 
                 # 필수 환경변수 확인
                 required_vars = ['LOTTO_USER_ID', 'LOTTO_PASSWORD']
+                missing = {var for var in required_vars
+                           if not env_vars.get(var) or env_vars[var].startswith('your_lotto')}
                 for var in required_vars:
-                    if var in env_vars and env_vars[var] and env_vars[var] != f'your_lotto_{var.lower().split("_")[1]}':
+                    if var not in missing:
                         self.log_success(f"{var} 설정됨")
-                    else:
+                for var in required_vars:
+                    if var in missing:
                         self.log_error(f"{var} 설정되지 않음 또는 기본값")
                 
                 # 선택적 환경변수 확인
@@ -129,49 +196,49 @@ class AutomationValidator:
     
     def check_configuration(self):
         """설정 파일 확인"""
-        print("\n⚙️ 설정 파일 확인 중...")
+        self.log_section("\n⚙️ 설정 파일 확인 중...")
         
-        if os.path.exists('lotto_config.json'):
-            try:
-                with open('lotto_config.json', 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                
-                self.log_success("설정 파일 로드 성공")
-                
-                # 필수 섹션 확인
-                required_sections = ['purchase', 'payment', 'options']
-                for section in required_sections:
-                    if section in config:
-                        self.log_success(f"'{section}' 섹션 존재")
-                    else:
-                        self.log_error(f"'{section}' 섹션 누락")
-                
-                # 구매 설정 확인
-                if 'purchase' in config:
-                    purchase = config['purchase']
-                    if 'lotto_list' in purchase and isinstance(purchase['lotto_list'], list):
-                        self.log_success(f"구매 설정: {len(purchase['lotto_list'])}개 게임")
-                        
-                        for i, game in enumerate(purchase['lotto_list']):
-                            if 'type' in game:
-                                game_type = game['type']
-                                numbers = game.get('numbers', [])
-                                self.log_success(f"  게임 {i+1}: {game_type} ({len(numbers)}개 번호)")
-                            else:
-                                self.log_error(f"  게임 {i+1}: 타입 누락")
-                    else:
-                        self.log_error("lotto_list 설정 오류")
-                
-            except json.JSONDecodeError as e:
-                self.log_error(f"설정 파일 JSON 파싱 실패: {e}")
-            except Exception as e:
-                self.log_error(f"설정 파일 읽기 실패: {e}")
-        else:
+        try:
+            config = _loads(Path('lotto_config.json').read_bytes())
+            
+            self.log_success("설정 파일 로드 성공")
+            
+            # 필수 섹션 확인
+            required_sections = ['purchase', 'payment', 'options']
+            missing = set(required_sections) - config.keys()
+            for section in required_sections:
+                if section not in missing:
+                    self.log_success(f"'{section}' 섹션 존재")
+            for section in required_sections:
+                if section in missing:
+                    self.log_error(f"'{section}' 섹션 누락")
+            
+            # 구매 설정 확인
+            if 'purchase' in config:
+                purchase = config['purchase']
+                if 'lotto_list' in purchase and isinstance(purchase['lotto_list'], list):
+                    self.log_success(f"구매 설정: {len(purchase['lotto_list'])}개 게임")
+                    
+                    for i, game in enumerate(purchase['lotto_list']):
+                        if 'type' in game:
+                            game_type = game['type']
+                            numbers = game.get('numbers', [])
+                            self.log_success(f"  게임 {i+1}: {game_type} ({len(numbers)}개 번호)")
+                        else:
+                            self.log_error(f"  게임 {i+1}: 타입 누락")
+                else:
+                    self.log_error("lotto_list 설정 오류")
+            
+        except FileNotFoundError:
             self.log_error("lotto_config.json 파일 없음")
+        except json.JSONDecodeError as e:
+            self.log_error(f"설정 파일 JSON 파싱 실패: {e}")
+        except Exception as e:
+            self.log_error(f"설정 파일 읽기 실패: {e}")
     
     def check_python_dependencies(self):
         """Python 의존성 확인"""
-        print("\n🐍 Python 의존성 확인 중...")
+        self.log_section("\n🐍 Python 의존성 확인 중...")
         
         required_modules = [
             'selenium',
@@ -180,44 +247,51 @@ class AutomationValidator:
             'cryptography'
         ]
         
+        # 모듈을 실제로 import 하지 않고 설치 위치만 확인
+        missing = {module for module in required_modules if importlib.util.find_spec(module) is None}
         for module in required_modules:
-            try:
-                __import__(module)
+            if module not in missing:
                 self.log_success(f"{module} 설치됨")
-            except ImportError:
+        for module in required_modules:
+            if module in missing:
                 self.log_warning(f"{module} 미설치 (도커에서 자동 설치됨)")
     
     def check_automated_script(self):
         """자동화 스크립트 구문 확인"""
-        print("\n📝 자동화 스크립트 확인 중...")
+        self.log_section("\n📝 자동화 스크립트 확인 중...")
         
         try:
             # Python 구문 검사
             with open('lotto_automated.py', 'r', encoding='utf-8') as f:
                 code = f.read()
             
-            compile(code, 'lotto_automated.py', 'exec')
+            # 구문 검사는 파싱까지만 (바이트코드 생성 생략), 결과 AST는 아래에서 재사용
+            tree = ast.parse(code, 'lotto_automated.py')
             self.log_success("자동화 스크립트 구문 검사 통과")
             
+            # 정의된 클래스/함수 이름을 AST 한 번 순회로 수집
+            names = {node.name for node in ast.walk(tree)
+                     if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))}
+            
             # 핵심 클래스 확인
-            if 'class AutomatedLottoBuyer' in code:
+            if 'AutomatedLottoBuyer' in names:
                 self.log_success("AutomatedLottoBuyer 클래스 존재")
             else:
                 self.log_error("AutomatedLottoBuyer 클래스 누락")
             
             # 핵심 메서드 확인
             required_methods = [
-                'def buy_lotto_games',
-                'def login', 
-                'def check_balance',
-                'def run'
+                'buy_lotto_games',
+                'login', 
+                'check_balance',
+                'run'
             ]
             
             for method in required_methods:
-                if method in code:
-                    self.log_success(f"{method.split()[1]} 메서드 존재")
+                if method in names:
+                    self.log_success(f"{method} 메서드 존재")
                 else:
-                    self.log_error(f"{method.split()[1]} 메서드 누락")
+                    self.log_error(f"{method} 메서드 누락")
                     
         except SyntaxError as e:
             self.log_error(f"구문 오류: {e}")
@@ -226,55 +300,54 @@ class AutomationValidator:
     
     def check_docker_build(self):
         """도커 빌드 테스트"""
-        print("\n🔨 도커 빌드 테스트 중...")
+        self.log_section("\n🔨 도커 빌드 테스트 중...")
         
         try:
             # 도커 이미지 빌드 테스트 (실제 빌드는 하지 않고 Dockerfile만 검사)
-            if os.path.exists('Dockerfile.optimized'):
-                self.log_success("최적화된 Dockerfile 존재")
-                
-                # Dockerfile 내용 간단 검사
-                with open('Dockerfile.optimized', 'r') as f:
-                    dockerfile_content = f.read()
-                
-                if 'FROM python:3.11-slim' in dockerfile_content:
-                    self.log_success("베이스 이미지 설정 확인")
-                else:
-                    self.log_warning("베이스 이미지 설정 확인 필요")
-                
-                if 'ENTRYPOINT' in dockerfile_content:
-                    self.log_success("엔트리포인트 설정됨")
-                else:
-                    self.log_warning("엔트리포인트 설정 확인 필요")
+            dockerfile_content = Path('Dockerfile.optimized').read_text()
+            self.log_success("최적화된 Dockerfile 존재")
+            
+            # Dockerfile 내용 간단 검사
+            if 'FROM python:3.11-slim' in dockerfile_content:
+                self.log_success("베이스 이미지 설정 확인")
+            else:
+                self.log_warning("베이스 이미지 설정 확인 필요")
+            
+            if 'ENTRYPOINT' in dockerfile_content:
+                self.log_success("엔트리포인트 설정됨")
             else:
-                self.log_error("Dockerfile.optimized 없음")
+                self.log_warning("엔트리포인트 설정 확인 필요")
                 
+        except FileNotFoundError:
+            self.log_error("Dockerfile.optimized 없음")
         except Exception as e:
             self.log_error(f"도커 빌드 테스트 실패: {e}")
     
     def validate_automation_readiness(self):
         """완전 자동화 준비 상태 검증"""
-        print("\n🤖 완전 자동화 준비 상태 검증 중...")
-        
-        # 사용자 입력이 필요한 코드 패턴 검사
-        problematic_patterns = [
-            'input(',
-            'getpass.getpass',
-            'raw_input',
-            'sys.stdin.read'
-        ]
+        self.log_section("\n🤖 완전 자동화 준비 상태 검증 중...")
         
         files_to_check = ['lotto_automated.py']
         
         for file_path in files_to_check:
-            if os.path.exists(file_path):
+            if self._file_exists(file_path):
                 with open(file_path, 'r', encoding='utf-8') as f:
                     content = f.read()
                 
-                found_issues = []
-                for pattern in problematic_patterns:
-                    if pattern in content:
-                        found_issues.append(pattern)
+                # 정규식에 걸리지 않으면 AST 분석 없이 통과
+                if not _PROBLEMATIC_RE.search(content):
+                    self.log_success(f"{file_path} 완전 자동화 호환")
+                    continue
+                
+                # 주석/문자열 안의 글자는 제외하도록 실제 호출만 AST로 확인
+                try:
+                    tree = ast.parse(content, file_path)
+                except SyntaxError as e:
+                    self.log_error(f"{file_path} 구문 오류: {e}")
+                    continue
+                
+                called = {_call_name(node.func) for node in ast.walk(tree) if isinstance(node, ast.Call)}
+                found_issues = [name for name in _PROBLEMATIC_CALLS if name in called]
                 
                 if found_issues:
                     self.log_error(f"{file_path}에서 사용자 입력 코드 발견: {', '.join(found_issues)}")
@@ -318,16 +391,36 @@ class AutomationValidator:
         print("🔍 완전 자동화 로또 구매 시스템 검증 시작")
         print("=" * 60)
         
-        self.check_files()
-        self.check_docker_environment() 
-        self.check_environment_variables()
-        self.check_configuration()
-        self.check_python_dependencies()
-        self.check_automated_script()
-        self.check_docker_build()
-        self.validate_automation_readiness()
+        checks = [
+            self.check_files,
+            self.check_docker_environment,
+            self.check_environment_variables,
+            self.check_configuration,
+            self.check_python_dependencies,
+            self.check_automated_script,
+            self.check_docker_build,
+            self.validate_automation_readiness,
+        ]
+        
+        # 서로 독립적인 검사를 동시에 실행하고, 출력은 검사 순서대로 반영
+        for records in asyncio.run(self._run_checks(checks)):
+            for level, message in records:
+                self._apply(level, message)
         
         return self.generate_report()
+    
+    def _collect(self, check):
+        """검사 하나를 실행하고 그 로그 기록을 반환 (작업 스레드에서 실행)"""
+        self._local.records = records = []
+        try:
+            check()
+        finally:
+            self._local.records = None
+        return records
+    
+    async def _run_checks(self, checks):
+        """모든 검사를 스레드로 동시에 실행"""
+        return await asyncio.gather(*(asyncio.to_thread(self._collect, check) for check in checks))
 
 def main():
     """메인 함수"""